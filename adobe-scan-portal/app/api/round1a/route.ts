@@ -1,8 +1,4 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { writeFile, unlink } from 'fs/promises'
-import { join } from 'path'
-import { tmpdir } from 'os'
-import { randomUUID } from 'crypto'
 
 // Import the Round 1A extractor
 const { spawn } = require('child_process')
@@ -11,11 +7,10 @@ const path = require('path')
 // Constants for optimization
 const MAX_FILE_SIZE = 50 * 1024 * 1024 // 50MB limit
 const PROCESS_TIMEOUT = 30000 // 30 seconds timeout
-const CLEANUP_TIMEOUT = 5000 // 5 seconds for cleanup
+const DEADLINE_MARGIN = 3000 // Python returns a partial outline this long before the timeout
 
 export async function POST(request: NextRequest) {
   const startTime = Date.now()
-  let tempFilePath: string | null = null
   
   try {
     const formData = await request.formData()
@@ -36,19 +31,15 @@ export async function POST(request: NextRequest) {
       }, { status: 400 })
     }
 
-    // Save the uploaded file temporarily with optimized buffer handling
+    // The upload is piped to Python's stdin and parsed from memory (no temp file)
     const bytes = await file.arrayBuffer()
     const buffer = Buffer.from(bytes)
-    
-    const tempId = randomUUID()
-    tempFilePath = join(tmpdir(), `upload_${tempId}.pdf`)
-    
-    await writeFile(tempFilePath, buffer)
 
     // Process with Round 1A Python script with timeout
     const result = await new Promise((resolve, reject) => {
       const pythonScript = path.join(process.cwd(), 'scripts', 'process_round1a_wrapper.py')
-      const python = spawn('python', [pythonScript, tempFilePath], {
+      const deadlineSeconds = String((PROCESS_TIMEOUT - DEADLINE_MARGIN) / 1000)
+      const python = spawn('python', [pythonScript, '--deadline', deadlineSeconds, '-'], {
         stdio: ['pipe', 'pipe', 'pipe'],
         timeout: PROCESS_TIMEOUT
       })
@@ -85,27 +76,19 @@ export async function POST(request: NextRequest) {
         python.kill('SIGKILL')
         reject(new Error('Processing timeout exceeded'))
       })
+
+      python.stdin.on('error', () => {
+        // The process exited before reading all input; 'close' reports the failure
+      })
+      python.stdin.end(buffer)
     })
 
     const processingTime = (Date.now() - startTime) / 1000
 
-    // Clean up temp file with timeout
-    if (tempFilePath) {
-      try {
-        await Promise.race([
-          unlink(tempFilePath),
-          new Promise((_, reject) => 
-            setTimeout(() => reject(new Error('Cleanup timeout')), CLEANUP_TIMEOUT)
-          )
-        ])
-      } catch (cleanupError) {
-        console.warn('Failed to cleanup temp file:', cleanupError)
-      }
-    }
-
     return NextResponse.json({
       success: true,
       processingTime,
+      partial: Boolean((result as any).partial),
       result,
       constraintsMet: {
         timeLimit: processingTime <= 10,
@@ -114,20 +97,6 @@ export async function POST(request: NextRequest) {
     })
 
   } catch (error) {
-    // Clean up temp file on error
-    if (tempFilePath) {
-      try {
-        await Promise.race([
-          unlink(tempFilePath),
-          new Promise((_, reject) => 
-            setTimeout(() => reject(new Error('Cleanup timeout')), CLEANUP_TIMEOUT)
-          )
-        ])
-      } catch (cleanupError) {
-        console.warn('Failed to cleanup temp file on error:', cleanupError)
-      }
-    }
-    
     const errorMessage = error instanceof Error ? error.message : String(error)
     return NextResponse.json({ 
       error: `Processing failed: ${errorMessage}`,
@@ -1,13 +1,20 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { writeFile, unlink, mkdir } from 'fs/promises'
-import { join } from 'path'
-import { tmpdir } from 'os'
-import { randomUUID } from 'crypto'
 import { existsSync } from 'fs'
 
 const { spawn } = require('child_process')
 const path = require('path')
 
+// Frames one upload for process_round1b_wrapper.py --stdin:
+// name length (4 bytes), UTF-8 name, payload length (8 bytes), PDF bytes; big-endian
+function pdfFrame(name: string, data: Buffer): Buffer {
+  const nameBytes = Buffer.from(name, 'utf-8')
+  const header = Buffer.alloc(4 + nameBytes.length + 8)
+  header.writeUInt32BE(nameBytes.length, 0)
+  nameBytes.copy(header, 4)
+  header.writeBigUInt64BE(BigInt(data.length), 4 + nameBytes.length)
+  return Buffer.concat([header, data])
+}
+
 export async function POST(request: NextRequest) {
   try {
     const formData = await request.formData()
@@ -35,15 +42,9 @@ export async function POST(request: NextRequest) {
       }, { status: 500 })
     }
 
-    // Create temporary directory for this request
-    const tempId = randomUUID()
-    const tempDir = join(tmpdir(), `round1b_${tempId}`)
-    await mkdir(tempDir, { recursive: true })
-
-    const savedFiles: string[] = []
-
     try {
-      // Save all uploaded files
+      // Frame all uploaded files; they are piped to Python and parsed from memory (no temp files)
+      const frames: Buffer[] = []
       for (let i = 0; i < files.length; i++) {
         const file = files[i]
         
@@ -52,11 +53,7 @@ export async function POST(request: NextRequest) {
         }
 
         const bytes = await file.arrayBuffer()
-        const buffer = Buffer.from(bytes)
-        const filePath = join(tempDir, `doc_${i}_${file.name}`)
-        
-        await writeFile(filePath, buffer)
-        savedFiles.push(filePath)
+        frames.push(pdfFrame(file.name, Buffer.from(bytes)))
       }
 
       // Process with Round 1B Python script
@@ -64,7 +61,7 @@ export async function POST(request: NextRequest) {
       
       const result = await new Promise((resolve, reject) => {
         const pythonScript = path.join(process.cwd(), 'scripts', 'process_round1b_wrapper.py')
-        const args = [pythonScript, modelsPath, persona, jobToBeDone, ...savedFiles]
+        const args = [pythonScript, '--stdin', modelsPath, persona, jobToBeDone]
         const python = spawn('python', args)
         
         let output = ''
@@ -90,14 +87,15 @@ export async function POST(request: NextRequest) {
             reject(new Error(`Python script failed: ${error}`))
           }
         })
+
+        python.stdin.on('error', () => {
+          // The process exited before reading all input; 'close' reports the failure
+        })
+        python.stdin.end(Buffer.concat(frames))
       })
 
       const processingTime = (Date.now() - startTime) / 1000
 
-      // Clean up temp directory
-      const rimraf = require('rimraf')
-      rimraf.sync(tempDir)
-
       return NextResponse.json({
         success: true,
         processingTime,
@@ -111,10 +109,6 @@ export async function POST(request: NextRequest) {
       })
 
     } catch (processingError) {
-      // Clean up temp directory on error
-      const rimraf = require('rimraf')
-      rimraf.sync(tempDir)
-      
       return NextResponse.json({ 
         error: `Processing failed: ${processingError}` 
       }, { status: 500 })
@@ -4,53 +4,138 @@ Wrapper script for Round 1A processing using your local implementation
 Called from the Next.js API route
 """
 
+import time
+
+# Deadlines are measured from process start, before the heavy imports
+SCRIPT_START = time.monotonic()
+
 import sys
 import os
 import json
+import tempfile
 
 # Add the round1a src to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 round1a_src = os.path.join(script_dir, '..', '..', 'round1a', 'src')
 sys.path.append(round1a_src)
 
+# Share parsed pages between Round 1A and Round 1B runs on the same upload
+os.environ.setdefault("PDF_PAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pdf_page_cache"))
+
 try:
-    from pdf_extractor_generic import extract_document_structure
+    from pdf_extractor_generic import iter_outline
+    from extractor_registry import DEFAULT_STRATEGY, available_strategies, extract_with_strategy, strategy_version
+    from outline_cache import OutlineCache, file_digest
+    from pdf_source import buffer_digest
+    from stage_metrics import StageMetrics, measure
 except ImportError as e:
     print(json.dumps({"error": f"Failed to import extractor: {e}"}), file=sys.stderr)
     sys.exit(1)
 
+# Clean the result to remove problematic Unicode characters
+def clean_text(obj):
+    if isinstance(obj, str):
+        # Replace problematic Unicode characters
+        return obj.replace('\u202f', ' ').replace('\u00a0', ' ').strip()
+    elif isinstance(obj, dict):
+        return {k: clean_text(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [clean_text(item) for item in obj]
+    return obj
+
+def pop_option(args, flag):
+    """Remove '<flag> <value>' from args and return the value, or None if absent."""
+    if flag not in args:
+        return None
+    index = args.index(flag)
+    value = args[index + 1] if index + 1 < len(args) else ''
+    del args[index:index + 2]
+    return value
+
 def main():
-    if len(sys.argv) != 2:
-        print(json.dumps({"error": "Usage: python process_round1a_wrapper.py <pdf_file>"}), file=sys.stderr)
+    args = sys.argv[1:]
+    ndjson = '--ndjson' in args
+    if ndjson:
+        args.remove('--ndjson')
+    collect_metrics = '--metrics' in args
+    if collect_metrics:
+        args.remove('--metrics')
+    
+    strategy = pop_option(args, '--strategy')
+    deadline_seconds = pop_option(args, '--deadline')
+    page_budget = pop_option(args, '--page-budget')
+    
+    if len(args) != 1:
+        print(json.dumps({"error": "Usage: python process_round1a_wrapper.py [--ndjson] [--metrics] [--strategy <name>] [--deadline <seconds>] [--page-budget <pages>] <pdf_file>"}), file=sys.stderr)
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
+    pdf_path = args[0]
     
-    if not os.path.exists(pdf_path):
+    if pdf_path == '-':
+        # The PDF is piped on stdin and parsed from memory, without a temp file
+        pdf_path = sys.stdin.buffer.read()
+    elif not os.path.exists(pdf_path):
         print(json.dumps({"error": f"File not found: {pdf_path}"}), file=sys.stderr)
         sys.exit(1)
     
     try:
-        # Extract document structure using your implementation
-        result, doc = extract_document_structure(pdf_path)
-        
-        # Close document to free memory
-        if doc:
-            doc.close()
-        
-        # Clean the result to remove problematic Unicode characters
-        def clean_text(obj):
-            if isinstance(obj, str):
-                # Replace problematic Unicode characters
-                return obj.replace('\u202f', ' ').replace('\u00a0', ' ').strip()
-            elif isinstance(obj, dict):
-                return {k: clean_text(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_text(item) for item in obj]
-            return obj
+        if strategy is None:
+            strategy = DEFAULT_STRATEGY
+        if strategy not in available_strategies():
+            print(json.dumps({"error": f"Unknown strategy '{strategy}'. Available: {', '.join(available_strategies())}"}), file=sys.stderr)
+            sys.exit(1)
+        if ndjson and strategy != DEFAULT_STRATEGY:
+            print(json.dumps({"error": "Streaming output is only available for the generic strategy"}), file=sys.stderr)
+            sys.exit(1)
+        
+        # Best-effort mode: finish before the caller's timeout, marking the result partial
+        options = {}
+        if deadline_seconds is not None:
+            options['deadline'] = SCRIPT_START + float(deadline_seconds)
+        if page_budget is not None:
+            options['page_budget'] = int(page_budget)
+        # Opt-in per-stage timings: added to the JSON output and dumped to stderr in Prometheus format
+        metrics = StageMetrics() if collect_metrics else None
+        if metrics is not None:
+            options['metrics'] = metrics
+        if options and strategy != DEFAULT_STRATEGY:
+            print(json.dumps({"error": "Deadlines, page budgets and metrics are only available for the generic strategy"}), file=sys.stderr)
+            sys.exit(1)
+        if ndjson and metrics is not None:
+            print(json.dumps({"error": "Metrics are not available with streaming output"}), file=sys.stderr)
+            sys.exit(1)
+        
+        if ndjson:
+            # Stream the title and then one heading per line as pages are parsed
+            for record in iter_outline(pdf_path, deadline=options.get('deadline')):
+                print(json.dumps(clean_text(record), ensure_ascii=True), flush=True)
+            return
+        
+        # Serve repeat uploads from the content-addressed cache
+        with measure(metrics, "cache_lookup"):
+            cache = OutlineCache()
+            digest = buffer_digest(pdf_path) if isinstance(pdf_path, bytes) else file_digest(pdf_path)
+            cache_key = cache.make_key(digest, strategy, strategy_version(strategy))
+            result = cache.get(cache_key)
+        
+        if result is None:
+            # Extract document structure using your implementation
+            result, doc = extract_with_strategy(pdf_path, strategy, **options)
+            
+            # Close document to free memory
+            if doc:
+                doc.close()
+            
+            # Partial outlines depend on timing, so they are never cached
+            if not result.get('partial'):
+                cache.put(cache_key, result)
         
         cleaned_result = clean_text(result)
         
+        if metrics is not None:
+            cleaned_result['metrics'] = metrics.as_dict()
+            print(metrics.to_prometheus(), file=sys.stderr, end='')
+        
         # Output result as JSON with ASCII encoding to avoid Unicode issues
         print(json.dumps(cleaned_result, ensure_ascii=True, indent=None))
         
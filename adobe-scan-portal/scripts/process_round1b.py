@@ -4,9 +4,15 @@ Standalone script for Round 1B processing
 Called from the Next.js API route
 """
 
+import time
+
+# Deadlines are measured from process start, before the model imports
+SCRIPT_START = time.monotonic()
+
 import sys
 import os
 import json
+import tempfile
 from datetime import datetime
 
 # Add the round1b src to path
@@ -14,23 +20,54 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 round1b_src = os.path.join(script_dir, '..', '..', 'round1b', 'src')
 sys.path.append(round1b_src)
 
+# Share parsed pages between Round 1A and Round 1B runs on the same upload
+os.environ.setdefault("PDF_PAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pdf_page_cache"))
+
+# Reuse chunk embeddings across uploads and concurrent requests
+os.environ.setdefault("EMBEDDING_STORE_DIR", os.path.join(tempfile.gettempdir(), "embedding_store"))
+
 try:
-    from pdf_extractor import extract_document_structure
-    from chunking import create_semantic_chunks
+    from document_pipeline import process_document
+    from near_duplicates import NearDuplicateIndex
+    from pdf_source import read_pdf_frames
     from semantic_ranker import SemanticRanker
+    from time_budget import corpus_deadlines, deadline_passed, document_deadlines
+    from stage_metrics import StageMetrics, measure
 except ImportError as e:
     print(json.dumps({"error": f"Failed to import modules: {e}"}), file=sys.stderr)
     sys.exit(1)
 
+def pop_option(args, flag):
+    """Remove '<flag> <value>' from args and return the value, or None if absent."""
+    if flag not in args:
+        return None
+    index = args.index(flag)
+    value = args[index + 1] if index + 1 < len(args) else ''
+    del args[index:index + 2]
+    return value
+
 def main():
-    if len(sys.argv) < 5:
-        print(json.dumps({"error": "Usage: python process_round1b.py <models_dir> <persona> <job_to_be_done> <pdf_file1> [pdf_file2] ..."}), file=sys.stderr)
+    args = sys.argv[1:]
+    from_stdin = '--stdin' in args
+    if from_stdin:
+        args.remove('--stdin')
+    collect_metrics = '--metrics' in args
+    if collect_metrics:
+        args.remove('--metrics')
+    cascade = '--cascade' in args
+    if cascade:
+        args.remove('--cascade')
+    deadline_seconds = pop_option(args, '--deadline')
+    page_budget = pop_option(args, '--page-budget')
+    
+    if len(args) < (3 if from_stdin else 4):
+        print(json.dumps({"error": "Usage: python process_round1b.py [--deadline <seconds>] [--page-budget <pages>] [--stdin] [--metrics] [--cascade] <models_dir> <persona> <job_to_be_done> [pdf_file1 pdf_file2 ...]"}), file=sys.stderr)
         sys.exit(1)
     
-    models_dir = sys.argv[1]
-    persona = sys.argv[2]
-    job_to_be_done = sys.argv[3]
-    pdf_files = sys.argv[4:]
+    models_dir = args[0]
+    persona = args[1]
+    job_to_be_done = args[2]
+    pdf_files = args[3:]
     
     # Validate inputs
     if not os.path.exists(models_dir):
@@ -42,34 +79,63 @@ def main():
             print(json.dumps({"error": f"PDF file not found: {pdf_file}"}), file=sys.stderr)
             sys.exit(1)
     
+    # (name, source) pairs: framed PDF bytes from stdin are parsed from memory, without temp files
+    try:
+        documents = read_pdf_frames(sys.stdin.buffer) if from_stdin else [(os.path.basename(f), f) for f in pdf_files]
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+    
     try:
+        # Opt-in per-stage timings: added to the JSON output and dumped to stderr in Prometheus format
+        metrics = StageMetrics() if collect_metrics else None
+        
         # Initialize semantic ranker
-        ranker = SemanticRanker(model_dir=models_dir)
+        with measure(metrics, "load_models"):
+            ranker = SemanticRanker(model_dir=models_dir)
+        
+        # Best-effort mode: share the time left evenly over the documents and
+        # return a result marked partial rather than running past the deadline
+        deadline = None if deadline_seconds is None else SCRIPT_START + float(deadline_seconds)
+        page_budget = None if page_budget is None else int(page_budget)
+        partial = False
+        skipped_documents = []
+        
+        # Repeated sections and boilerplate are scored once across all documents
+        duplicates = NearDuplicateIndex()
         
         # Process each PDF and collect chunks
         all_chunks = []
         
-        for pdf_path in pdf_files:
-            # Extract structure
-            outline_data, doc = extract_document_structure(pdf_path)
-            
-            # Create chunks
-            outline_json = json.dumps(outline_data, indent=2)
-            chunks = create_semantic_chunks(pdf_path, outline_json)
+        extraction_deadline, rank_deadline = corpus_deadlines(deadline)
+        extracted = []
+        
+        for index, (doc_name, pdf_source) in enumerate(documents):
+            if deadline_passed(extraction_deadline):
+                skipped_documents.append(doc_name)
+                continue
+            _, extract_deadline = document_deadlines(extraction_deadline, len(documents) - index)
             
-            # Rank chunks for this document
-            ranked = ranker.rank_chunks(chunks, persona, job_to_be_done)
+            # Extract structure and create chunks from a single parse
+            outline_data, chunks = process_document(pdf_source, doc_name, deadline=extract_deadline,
+                                                    page_budget=page_budget, metrics=metrics)
+            partial = partial or outline_data.get('partial', False)
+            extracted.append((doc_name, chunks))
+        
+        # Rank all documents' chunks in one pass
+        ranked_documents = ranker.rank_corpus([chunks for _, chunks in extracted], persona, job_to_be_done,
+                                              per_document=3, deadline=rank_deadline, metrics=metrics,
+                                              duplicates=duplicates, cascade=cascade)
+        
+        for (doc_name, _), ranked in zip(extracted, ranked_documents):
+            partial = partial or any(not chunk.get('reranked', True) for chunk in ranked)
             
             # Take top 3 chunks from each document instead of just 1
             # This gives us more variety and better coverage
-            for i, chunk in enumerate(ranked[:3]):
-                chunk["document"] = os.path.basename(pdf_path)
+            for i, chunk in enumerate(ranked):
+                chunk["document"] = doc_name
                 chunk["doc_rank"] = i + 1  # Track ranking within document
                 all_chunks.append(chunk)
-            
-            # Close document
-            if doc:
-                doc.close()
         
         # Enhanced filtering and ranking with more aggressive filtering
         filtered_chunks = []
@@ -188,7 +254,7 @@ def main():
         
         result = {
             "metadata": {
-                "input_documents": [os.path.basename(f) for f in pdf_files],
+                "input_documents": [name for name, _ in documents],
                 "persona": persona,
                 "job_to_be_done": job_to_be_done,
                 "processing_timestamp": datetime.now().isoformat()
@@ -196,6 +262,9 @@ def main():
             "extracted_sections": extracted_sections,
             "subsection_analysis": subsection_analysis
         }
+        if partial or skipped_documents:
+            result["partial"] = True
+            result["metadata"]["skipped_documents"] = skipped_documents
         
         # Clean the result to remove problematic Unicode characters
         def clean_text(obj):
@@ -209,6 +278,9 @@ def main():
             return obj
         
         cleaned_result = clean_text(result)
+        if metrics is not None:
+            cleaned_result['metrics'] = metrics.as_dict()
+            print(metrics.to_prometheus(), file=sys.stderr, end='')
         
         # Output result as JSON with ASCII encoding to avoid Unicode issues
         print(json.dumps(cleaned_result, ensure_ascii=True, indent=None))
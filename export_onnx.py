@@ -0,0 +1,77 @@
+"""
+Export the Round 1B models to ONNX and quantize them to int8, for the ranker's
+ONNX Runtime backend (RANKER_BACKEND=onnx). Run after download_models.py.
+
+Writes <model>/onnx/model.onnx (fp32) and <model>/onnx/model_int8.onnx
+(dynamic int8 quantization) for both models.
+"""
+
+import argparse
+import os
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+RERANKER_MODEL = 'cross-encoder-ms-marco-MiniLM-L6-v2'
+
+INPUT_NAMES = ('input_ids', 'attention_mask', 'token_type_ids')
+
+
+def export_model(model_path, model_class, output_names, opset):
+    """
+    Export one model's transformer to ONNX with dynamic batch and sequence axes, then quantize it.
+
+    Pooling, normalization and activations stay outside the graph; onnx_backend applies them.
+    """
+    onnx_dir = os.path.join(model_path, 'onnx')
+    os.makedirs(onnx_dir, exist_ok=True)
+    fp32_path = os.path.join(onnx_dir, 'model.onnx')
+    int8_path = os.path.join(onnx_dir, 'model_int8.onnx')
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    # torchscript=True makes the model return plain tuples, which trace cleanly
+    model = model_class.from_pretrained(model_path, torchscript=True)
+    model.eval()
+
+    sample = tokenizer(["what is the capital of france"], ["paris is the capital of france"], return_tensors='pt')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in INPUT_NAMES}
+    dynamic_axes.update({name: {0: 'batch', 1: 'sequence'} if name == 'last_hidden_state' else {0: 'batch'}
+                         for name in output_names})
+
+    print(f"Exporting {model_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in INPUT_NAMES),
+            fp32_path,
+            input_names=list(INPUT_NAMES),
+            output_names=list(output_names),
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    print(f"Quantizing {fp32_path} to int8...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Saved {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB) and "
+          f"{int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Round 1B models to int8 ONNX")
+    parser.add_argument("--models-dir", default="./models", help="Directory written by download_models.py")
+    parser.add_argument("--opset", type=int, default=14, help="ONNX opset version")
+    args = parser.parse_args()
+
+    export_model(os.path.join(args.models_dir, EMBEDDING_MODEL), AutoModel,
+                 ('last_hidden_state', 'pooler_output'), args.opset)
+    export_model(os.path.join(args.models_dir, RERANKER_MODEL), AutoModelForSequenceClassification,
+                 ('logits',), args.opset)
+    print("All models exported successfully!")
+
+
+if __name__ == "__main__":
+    main()
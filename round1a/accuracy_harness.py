@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Accuracy Harness for Round 1A - Document Structure Extraction
+Scores every extractor strategy and fast-path mode against golden outlines, next to latency.
+
+A corpus is a directory of PDFs, each with a golden '<name>.json' beside it in the
+extractor output schema: {"title": ..., "outline": [{"level", "text", "page"}]}.
+
+Usage (from the round1a directory):
+    python accuracy_harness.py --corpus path/to/golden_corpus
+    python accuracy_harness.py --synthetic                  # generate a labelled corpus first
+    python accuracy_harness.py --synthetic --modes generic generic+toc generic+sampled
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import numpy as np
+
+from extractor_registry import DEFAULT_STRATEGY, available_strategies, extract_with_strategy
+from pdf_extractor_generic import extract_document_structure, iter_outline
+from synthetic_pdf import HIERARCHIES, corpus_name, generate_document
+
+
+# Synthetic corpus grid; documents carry bookmarks so the TOC mode has something to read
+SYNTHETIC_PAGES = (12, 60)
+SYNTHETIC_COLUMNS = (1, 2)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+
+def _stream_outline(pdf_path):
+    """Collect iter_outline's records into the extract_document_structure schema."""
+    output = {"title": "Title Not Found", "outline": []}
+    for record in iter_outline(pdf_path, use_toc=False):
+        if 'title' in record:
+            output['title'] = record['title']
+        elif 'level' in record:
+            output['outline'].append(record)
+    return output
+
+
+def build_modes(workers):
+    """
+    Extraction modes by name: every registered strategy plus the generic fast paths.
+
+    "generic" is the full font-heuristic scan (no TOC), the baseline the
+    fast paths are measured against.
+
+    Returns:
+        dict: mode name -> function(pdf_path) returning outline_data
+    """
+    def strategy_mode(name):
+        return lambda pdf_path: _close(*extract_with_strategy(pdf_path, name))
+
+    modes = {name: strategy_mode(name) for name in available_strategies() if name != DEFAULT_STRATEGY}
+    modes.update({
+        "generic": lambda pdf_path: _close(*extract_document_structure(pdf_path, use_toc=False)),
+        "generic+toc": lambda pdf_path: _close(*extract_document_structure(pdf_path, use_toc=True)),
+        "generic+sampled": _stream_outline,
+        "generic+parallel": lambda pdf_path: _close(*extract_document_structure(pdf_path, workers=workers,
+                                                                                use_toc=False)),
+    })
+    return modes
+
+
+def _close(outline_data, doc):
+    if doc:
+        doc.close()
+    return outline_data
+
+
+def load_corpus(corpus_dir):
+    """
+    Find PDFs with a golden outline beside them.
+
+    Returns:
+        list: (document name, pdf path, golden outline_data) in name order
+    """
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        stem, ext = os.path.splitext(name)
+        golden_path = os.path.join(corpus_dir, stem + ".json")
+        if ext.lower() == ".pdf" and os.path.exists(golden_path):
+            with open(golden_path, 'r', encoding='utf-8') as f:
+                corpus.append((name, os.path.join(corpus_dir, name), json.load(f)))
+    return corpus
+
+
+def build_synthetic_corpus(corpus_dir):
+    """Generate labelled synthetic documents (PDF plus golden JSON) that are not there yet."""
+    for pages in SYNTHETIC_PAGES:
+        for hierarchy in sorted(HIERARCHIES):
+            for columns in SYNTHETIC_COLUMNS:
+                params = {"pages": pages, "hierarchy": hierarchy, "columns": columns, "toc": True}
+                pdf_path = os.path.join(corpus_dir, corpus_name(**params))
+                golden_path = os.path.splitext(pdf_path)[0] + ".json"
+                if os.path.exists(pdf_path) and os.path.exists(golden_path):
+                    continue
+                golden = generate_document(pdf_path, **params)
+                with open(golden_path, 'w', encoding='utf-8') as f:
+                    json.dump(golden, f, indent=2)
+
+
+def normalize_text(text):
+    """Compare headings case-insensitively, ignoring surrounding and repeated whitespace."""
+    return re.sub(r'\s+', ' ', text).strip().casefold()
+
+
+def score_outline(predicted, golden):
+    """
+    Match predicted headings to golden ones by (normalized text, page).
+
+    Returns:
+        dict: Counts (predicted, golden, matched, level_correct) and title_correct
+    """
+    def by_key(outline):
+        groups = defaultdict(list)
+        for heading in outline:
+            groups[(normalize_text(heading['text']), heading['page'])].append(heading['level'])
+        return groups
+
+    predicted_groups, golden_groups = by_key(predicted['outline']), by_key(golden['outline'])
+    matched = level_correct = 0
+    for key, golden_levels in golden_groups.items():
+        predicted_levels = predicted_groups.get(key, [])
+        # Duplicates pair up by level first, so a repeated heading is not penalised twice
+        common = Counter(golden_levels) & Counter(predicted_levels)
+        level_correct += sum(common.values())
+        matched += min(len(golden_levels), len(predicted_levels))
+
+    return {
+        'predicted': len(predicted['outline']),
+        'golden': len(golden['outline']),
+        'matched': matched,
+        'level_correct': level_correct,
+        'title_correct': normalize_text(predicted['title']) == normalize_text(golden['title']),
+    }
+
+
+def rates(counts):
+    """Precision, recall, F1 and level accuracy from summed match counts."""
+    precision = counts['matched'] / counts['predicted'] if counts['predicted'] else 0.0
+    recall = counts['matched'] / counts['golden'] if counts['golden'] else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    level_accuracy = counts['level_correct'] / counts['matched'] if counts['matched'] else 0.0
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4),
+            'level_accuracy': round(level_accuracy, 4)}
+
+
+def evaluate(modes, corpus, repeats):
+    """
+    Run every mode on every document.
+
+    Returns:
+        tuple: (per-document rows, per-mode summary dict)
+    """
+    rows = []
+    summary = {}
+    for mode, run in modes.items():
+        totals = Counter()
+        latencies = []
+        for name, pdf_path, golden in corpus:
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                predicted = run(pdf_path)
+                timings.append(time.perf_counter() - started)
+            latency = float(np.median(timings))
+            latencies.append(latency)
+
+            counts = score_outline(predicted, golden)
+            totals.update({key: int(value) for key, value in counts.items()})
+            rows.append(dict(mode=mode, document=name, latency_seconds=round(latency, 4),
+                             **counts, **rates(counts)))
+
+        p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (0.0, 0.0)
+        summary[mode] = dict(
+            rates(totals),
+            title_accuracy=round(totals['title_correct'] / len(corpus), 4) if corpus else 0.0,
+            latency_p50=round(float(p50), 4),
+            latency_p95=round(float(p95), 4),
+            total_seconds=round(sum(latencies), 4),
+        )
+    return rows, summary
+
+
+def parse_args(mode_names):
+    parser = argparse.ArgumentParser(description="Round 1A outline accuracy against golden outlines, with latency")
+    parser.add_argument("--corpus", default=None, help="Directory of PDFs with golden '<name>.json' outlines")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Generate a labelled synthetic corpus (in --corpus, or the temp directory)")
+    parser.add_argument("--modes", nargs='+', choices=mode_names, default=mode_names, help="Modes to evaluate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Workers for generic+parallel")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed runs per document (median is reported)")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmark_results/accuracy_<time>.json)")
+    return parser.parse_args()
+
+
+def main():
+    modes = build_modes(workers=None)
+    args = parse_args(sorted(modes))
+    modes = build_modes(workers=args.workers)
+
+    # Measure extraction, not the shared page cache
+    os.environ.pop("PDF_PAGE_CACHE_DIR", None)
+
+    corpus_dir = args.corpus
+    if args.synthetic:
+        corpus_dir = corpus_dir or os.path.join(tempfile.gettempdir(), "round1a_golden_corpus")
+        build_synthetic_corpus(corpus_dir)
+    if not corpus_dir:
+        print("Error: pass --corpus <dir> and/or --synthetic")
+        sys.exit(1)
+
+    corpus = load_corpus(corpus_dir)
+    if not corpus:
+        print(f"Error: no PDFs with golden outlines found in {corpus_dir}")
+        sys.exit(1)
+
+    rows, summary = evaluate({mode: modes[mode] for mode in args.modes}, corpus, args.repeats)
+
+    print(f"{'mode':<18} {'precision':>9} {'recall':>7} {'f1':>7} {'levels':>7} {'title':>6} {'p50 s':>8} {'p95 s':>8}")
+    for mode, stats in summary.items():
+        print(f"{mode:<18} {stats['precision']:>9.3f} {stats['recall']:>7.3f} {stats['f1']:>7.3f} "
+              f"{stats['level_accuracy']:>7.3f} {stats['title_accuracy']:>6.2f} "
+              f"{stats['latency_p50']:>8.3f} {stats['latency_p95']:>8.3f}")
+
+    output_path = args.output or os.path.join(
+        RESULTS_DIR, "accuracy_%s.json" % datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"created": datetime.now().isoformat(), "corpus": corpus_dir, "documents": len(corpus),
+                   "repeats": args.repeats, "summary": summary, "documents_detail": rows}, f, indent=2)
+    print(f"\nResults saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Round 1A - Document Structure Extraction
+Times every extractor strategy on a synthetic corpus and saves the results as JSON.
+
+Usage (from the round1a directory):
+    python benchmark.py                                  # full grid, 10 to 5000 pages
+    python benchmark.py --pages 10 100 --strategies generic final
+    python benchmark.py --compare benchmark_results/<old>.json
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from extractor_registry import available_strategies, extract_with_strategy
+from synthetic_pdf import HIERARCHIES, corpus_name, generate_document
+
+
+DEFAULT_PAGES = (10, 100, 1000, 5000)
+DEFAULT_COLUMNS = (1, 2)
+DEFAULT_REPEATS = 3
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Round 1A extractor benchmarks on a synthetic corpus")
+    parser.add_argument("--pages", type=int, nargs='+', default=list(DEFAULT_PAGES), help="Page counts in the grid")
+    parser.add_argument("--hierarchies", nargs='+', choices=sorted(HIERARCHIES), default=sorted(HIERARCHIES),
+                        help="Font-size hierarchies in the grid")
+    parser.add_argument("--columns", type=int, nargs='+', default=list(DEFAULT_COLUMNS), help="Column layouts in the grid")
+    parser.add_argument("--images", choices=["with", "without", "both"], default="both",
+                        help="Include image-heavy documents, plain ones, or both")
+    parser.add_argument("--strategies", nargs='+', choices=available_strategies(), default=available_strategies(),
+                        help="Extractor strategies to time")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per document and strategy")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "round1a_bench_corpus"),
+                        help="Where generated PDFs are kept between runs")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmark_results/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare p50 latencies against")
+    return parser.parse_args()
+
+
+def build_corpus(args):
+    """
+    Generate (or reuse) one PDF per grid point.
+
+    Returns:
+        list: Document descriptors with path and generator parameters
+    """
+    images = {"with": (True,), "without": (False,), "both": (False, True)}[args.images]
+    corpus = []
+    for pages, hierarchy, columns, with_images in itertools.product(args.pages, args.hierarchies, args.columns, images):
+        params = {"pages": pages, "hierarchy": hierarchy, "columns": columns, "images": with_images}
+        path = os.path.join(args.corpus_dir, corpus_name(**params))
+        if not os.path.exists(path):
+            print(f"Generating {os.path.basename(path)}", file=sys.stderr)
+            generate_document(path, **params)
+        corpus.append(dict(params, document=os.path.basename(path), path=path))
+    return corpus
+
+
+def _time_strategy(pdf_path, strategy, repeats, conn):
+    """Worker body: run one strategy `repeats` times and report latencies and peak RSS."""
+    try:
+        latencies = []
+        headings = 0
+        for _ in range(repeats):
+            started = time.perf_counter()
+            outline_data, doc = extract_with_strategy(pdf_path, strategy)
+            latencies.append(time.perf_counter() - started)
+            if doc:
+                doc.close()
+            headings = len(outline_data['outline'])
+        # ru_maxrss is in kilobytes on Linux
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        conn.send({'status': 'ok', 'latencies': latencies, 'headings': headings, 'peak_rss_mb': peak_rss_mb})
+    except Exception as e:
+        conn.send({'status': 'error', 'error': str(e)})
+    finally:
+        conn.close()
+
+
+def measure_strategy(pdf_path, strategy, repeats):
+    """
+    Time one strategy on one document in a fresh process, so peak RSS is its own.
+
+    Returns:
+        dict: Worker report ('status' plus latencies, headings and peak_rss_mb)
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_time_strategy, args=(pdf_path, strategy, repeats, sender), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        report = receiver.recv()
+    except EOFError:
+        report = {'status': 'crashed', 'error': "worker exited without a report"}
+    process.join()
+    return report
+
+
+def summarize(document, strategy, report):
+    """Result row for one (document, strategy) pair."""
+    row = {key: document[key] for key in ("document", "pages", "hierarchy", "columns", "images")}
+    row.update(strategy=strategy, status=report['status'])
+    if report['status'] != 'ok':
+        row['error'] = report['error']
+        return row
+
+    p50, p95 = np.percentile(report['latencies'], [50, 95])
+    row.update(
+        runs=len(report['latencies']),
+        latency_p50=round(float(p50), 4),
+        latency_p95=round(float(p95), 4),
+        pages_per_second=round(document['pages'] / p50, 1) if p50 > 0 else None,
+        peak_rss_mb=round(report['peak_rss_mb'], 1),
+        headings=report['headings'],
+    )
+    return row
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print p50 latency ratios against an earlier result file (<1.0 is faster)."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(row['document'], row['strategy']): row for row in baseline['results'] if row['status'] == 'ok'}
+
+    print(f"\nComparison with {baseline.get('commit') or baseline_path} (p50 ratio, <1.0 is faster):")
+    for row in results:
+        old = previous.get((row['document'], row['strategy']))
+        if row['status'] == 'ok' and old and old['latency_p50'] > 0:
+            ratio = row['latency_p50'] / old['latency_p50']
+            print(f"  {row['document']:<45} {row['strategy']:<12} {old['latency_p50']:>8.3f}s -> "
+                  f"{row['latency_p50']:>8.3f}s  x{ratio:.2f}")
+
+
+def main():
+    args = parse_args()
+
+    # Measure parsing, not the shared page cache
+    os.environ.pop("PDF_PAGE_CACHE_DIR", None)
+
+    corpus = build_corpus(args)
+    results = []
+    for document in corpus:
+        for strategy in args.strategies:
+            report = measure_strategy(document['path'], strategy, args.repeats)
+            row = summarize(document, strategy, report)
+            results.append(row)
+            if row['status'] == 'ok':
+                print(f"{row['document']:<45} {strategy:<12} p50 {row['latency_p50']:>8.3f}s  "
+                      f"p95 {row['latency_p95']:>8.3f}s  {row['pages_per_second']:>8} pages/s  "
+                      f"{row['peak_rss_mb']:>7} MB")
+            else:
+                print(f"{row['document']:<45} {strategy:<12} {row['status']}: {row['error']}")
+
+    commit = git_commit()
+    output = {
+        "commit": commit,
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "machine": {"platform": platform.platform(), "cpus": os.cpu_count()},
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+    output_path = args.output or os.path.join(RESULTS_DIR, f"{commit or 'unversioned'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults saved to: {output_path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Batch Runner for Round 1A
+Extracts outlines for many PDFs on a pool of isolated worker processes.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from extractor_registry import DEFAULT_STRATEGY, extract_with_strategy
+
+
+# Seconds a single document may take before its worker is killed
+DEFAULT_FILE_TIMEOUT = 60.0
+
+SUMMARY_FILE_NAME = "batch_summary.json"
+
+
+def read_manifest(manifest_path, input_dir):
+    """
+    Read a manifest with one PDF path per line.
+
+    Blank lines and lines starting with '#' are ignored; relative paths are
+    resolved against the input directory.
+
+    Returns:
+        list: Absolute PDF paths in manifest order
+    """
+    pdf_paths = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                pdf_paths.append(os.path.join(input_dir, line))
+    return pdf_paths
+
+
+def output_names(pdf_paths):
+    """Map each input to a unique '<name>.json' output file name."""
+    names = []
+    used = {SUMMARY_FILE_NAME}
+    for pdf_path in pdf_paths:
+        stem = os.path.splitext(os.path.basename(pdf_path))[0]
+        name = stem + ".json"
+        suffix = 2
+        while name in used:
+            name = f"{stem}_{suffix}.json"
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _process_file(pdf_path, output_path, strategy, conn):
+    """Worker body: extract one document, write its JSON and report back."""
+    started = time.perf_counter()
+    try:
+        outline_data, doc = extract_with_strategy(pdf_path, strategy)
+        if doc:
+            doc.close()
+
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(outline_data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, output_path)
+
+        conn.send({
+            'status': 'ok',
+            'title': outline_data['title'],
+            'headings': len(outline_data['outline']),
+            'extract_seconds': round(time.perf_counter() - started, 3),
+        })
+    except Exception as e:
+        conn.send({'status': 'error', 'error': str(e)})
+    finally:
+        conn.close()
+
+
+def _receive_report(receiver, process):
+    """Read a finished worker's report; a worker that died without one crashed."""
+    try:
+        if receiver.poll():
+            return receiver.recv()
+    except EOFError:
+        pass
+    return {'status': 'crashed', 'error': f"worker exited with code {process.exitcode}"}
+
+
+def run_batch(pdf_paths, output_dir, workers=None, timeout=DEFAULT_FILE_TIMEOUT, strategy=DEFAULT_STRATEGY):
+    """
+    Process every PDF in its own worker process, at most `workers` at a time.
+
+    A worker that raises, dies or exceeds the timeout only fails its own
+    file; every other document is still processed and written.
+
+    Args:
+        pdf_paths (list): PDF files to process
+        output_dir (str): Directory receiving '<name>.json' files and the summary
+        workers (int): Concurrent worker processes; None uses every CPU
+        timeout (float): Per-file limit in seconds
+        strategy (str): Extractor strategy name from extractor_registry
+
+    Returns:
+        dict: Batch summary, also written to output_dir/batch_summary.json
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    batch_started = time.perf_counter()
+
+    results = [None] * len(pdf_paths)
+    pending = deque(zip(range(len(pdf_paths)), pdf_paths, output_names(pdf_paths)))
+    running = {}  # process sentinel -> (index, process, connection, start time)
+
+    while pending or running:
+        # Keep the pool full
+        while pending and len(running) < workers:
+            index, pdf_path, name = pending.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_process_file, args=(pdf_path, os.path.join(output_dir, name), strategy, sender), daemon=True)
+            process.start()
+            sender.close()
+            running[process.sentinel] = (index, process, receiver, time.perf_counter())
+            results[index] = {'file': os.path.basename(pdf_path), 'output': name}
+
+        # Sleep until a worker exits or the earliest deadline passes
+        next_deadline = min(started for _, _, _, started in running.values()) + timeout
+        finished = wait(list(running), timeout=max(0.0, next_deadline - time.perf_counter()))
+
+        now = time.perf_counter()
+        for sentinel in list(running):
+            index, process, receiver, started = running[sentinel]
+            if sentinel not in finished and now - started < timeout:
+                continue
+
+            if sentinel in finished:
+                process.join()
+                report = _receive_report(receiver, process)
+            else:
+                process.kill()
+                process.join()
+                report = {'status': 'timeout', 'error': f"exceeded {timeout:g}s"}
+
+            if report['status'] != 'ok':
+                # Drop any half-written output left behind by the worker
+                try:
+                    os.remove(os.path.join(output_dir, results[index]['output'] + ".tmp"))
+                except OSError:
+                    pass
+
+            receiver.close()
+            del running[sentinel]
+            results[index].update(report)
+            results[index]['seconds'] = round(now - started, 3)
+
+    summary = {
+        'total': len(results),
+        'succeeded': sum(result['status'] == 'ok' for result in results),
+        'failed': sum(result['status'] != 'ok' for result in results),
+        'workers': workers,
+        'strategy': strategy,
+        'elapsed_seconds': round(time.perf_counter() - batch_started, 3),
+        'files': results,
+    }
+    with open(os.path.join(output_dir, SUMMARY_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
@@ -0,0 +1,108 @@
+"""
+Extractor Strategy Registry for Round 1A
+Selects a heading policy by name and runs several policies over one parsed page model.
+"""
+
+import pdf_extractor
+import pdf_extractor_balanced
+import pdf_extractor_corrected
+import pdf_extractor_final
+import pdf_extractor_generic
+import pdf_extractor_improved
+import pdf_extractor_istqb
+import pdf_extractor_istqb_final
+from page_model import build_document_model
+from pdf_source import open_pdf
+
+
+DEFAULT_STRATEGY = "generic"
+
+# name -> module (or any object) exposing extract_document_structure(pdf_path)
+# and outline_from_model(model, doc)
+STRATEGIES = {
+    "base": pdf_extractor,
+    "generic": pdf_extractor_generic,
+    "final": pdf_extractor_final,
+    "balanced": pdf_extractor_balanced,
+    "corrected": pdf_extractor_corrected,
+    "improved": pdf_extractor_improved,
+    "istqb": pdf_extractor_istqb,
+    "istqb_final": pdf_extractor_istqb_final,
+}
+
+# name -> output version, part of the outline cache key; bump a strategy's
+# version whenever its output changes
+STRATEGY_VERSIONS = {
+    "base": "3",
+    "generic": pdf_extractor_generic.EXTRACTOR_VERSION,
+    "final": "3",
+    "balanced": "3",
+    "corrected": "2",
+    "improved": "2",
+    "istqb": "3",
+    "istqb_final": "2",
+}
+
+
+def register_strategy(name, strategy, version="1"):
+    """
+    Add or replace a strategy.
+
+    Args:
+        name (str): Name used to select the strategy
+        strategy: Object with extract_document_structure(pdf_path) and outline_from_model(model, doc)
+        version (str): Output version; change it whenever the strategy's output changes
+    """
+    STRATEGIES[name] = strategy
+    STRATEGY_VERSIONS[name] = version
+
+
+def get_strategy(name):
+    """Look up a strategy by name, raising ValueError for unknown names."""
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown extractor strategy '{name}'. Available: {', '.join(sorted(STRATEGIES))}")
+
+
+def strategy_version(name):
+    """Output version of a strategy, for cache keys; raises ValueError for unknown names."""
+    get_strategy(name)
+    return STRATEGY_VERSIONS[name]
+
+
+def available_strategies():
+    return sorted(STRATEGIES)
+
+
+def extract_with_strategy(pdf_path, strategy=DEFAULT_STRATEGY, **options):
+    """
+    Run a single strategy through its own entry point.
+
+    Extra options (e.g. workers, use_toc for "generic") are passed through.
+
+    Returns:
+        tuple: (outline_data dict, document object)
+    """
+    return get_strategy(strategy).extract_document_structure(pdf_path, **options)
+
+
+def run_strategies(pdf_path, strategies=None):
+    """
+    Parse a document once and apply several strategies to the same page model.
+
+    Args:
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        strategies (list): Strategy names; None runs every registered strategy
+
+    Returns:
+        dict: strategy name -> outline_data
+    """
+    selected = [(name, get_strategy(name)) for name in (strategies or available_strategies())]
+
+    doc = open_pdf(pdf_path)
+    try:
+        model = build_document_model(doc)
+        return {name: strategy.outline_from_model(model, doc) for name, strategy in selected}
+    finally:
+        doc.close()
@@ -0,0 +1,126 @@
+"""
+Sampled Body-Font Profiling for Round 1A
+Estimates the body text style from a stratified sample of pages with early stopping.
+"""
+
+import math
+import random
+from collections import Counter
+
+from page_model import build_document_model
+
+
+# Pages examined before the stopping rule is consulted
+SAMPLE_MIN_PAGES = 8
+
+# Upper bound on sampled pages (one per stratum)
+SAMPLE_MAX_PAGES = 64
+
+# z-score the leader's per-page margin over the runner-up must reach to stop early
+SAMPLE_Z_THRESHOLD = 3.0
+
+
+def _page_histogram(doc, page_num):
+    return build_document_model(doc, page_num, page_num + 1).font_histogram()
+
+
+def _stratified_pages(page_count, strata, seed):
+    """
+    One random page from each of `strata` equal slices of the document.
+
+    Strata are visited in bit-reversed order, so every prefix of the result
+    is spread across the whole document rather than clustered at the front.
+    """
+    rng = random.Random(seed)
+    bits = max(1, (strata - 1).bit_length())
+    order = sorted(range(strata), key=lambda i: int(format(i, '0%db' % bits)[::-1], 2))
+
+    pages = []
+    for stratum in order:
+        start = page_count * stratum // strata
+        stop = max(start + 1, page_count * (stratum + 1) // strata)
+        pages.append(rng.randrange(start, stop))
+    return pages
+
+
+def _leader_is_stable(page_histograms, font_counts, z_threshold):
+    """
+    Check whether the leading style clearly beats the runner-up.
+
+    Each sampled page contributes the difference between the leader's and
+    the runner-up's share of its characters; the leader is stable when the
+    mean difference is z_threshold standard errors above zero.
+    """
+    ranked = font_counts.most_common(2)
+    leader = ranked[0][0]
+    runner_up = ranked[1][0] if len(ranked) > 1 else None
+
+    margins = []
+    for counts in page_histograms:
+        total = sum(counts.values())
+        margins.append((counts.get(leader, 0) - counts.get(runner_up, 0)) / total)
+
+    n = len(margins)
+    if n < 2:
+        return False
+    mean = sum(margins) / n
+    variance = sum((m - mean) ** 2 for m in margins) / (n - 1)
+    if variance == 0:
+        return mean > 0
+    return mean / math.sqrt(variance / n) >= z_threshold
+
+
+def estimate_body_style(doc, min_pages=SAMPLE_MIN_PAGES, max_pages=SAMPLE_MAX_PAGES,
+                        z_threshold=SAMPLE_Z_THRESHOLD, seed=0):
+    """
+    Estimate the most common (size, font) style from a stratified page sample.
+
+    Args:
+        doc (fitz.Document): Open PyMuPDF document
+        min_pages (int): Pages sampled before early stopping is allowed
+        max_pages (int): Maximum pages sampled
+        z_threshold (float): Confidence required to accept the leader
+        seed (int): Seed for the page choice within each stratum
+
+    Returns:
+        tuple: (size, font name), or None when the sample is ambiguous
+    """
+    font_counts = Counter()
+    page_histograms = []
+
+    for page_num in _stratified_pages(doc.page_count, min(max_pages, doc.page_count), seed):
+        counts = _page_histogram(doc, page_num)
+        if not sum(counts.values()):
+            continue  # image-only, blank or whitespace-only page
+        font_counts.update(counts)
+        page_histograms.append(counts)
+
+        if len(page_histograms) >= min_pages and _leader_is_stable(page_histograms, font_counts, z_threshold):
+            return font_counts.most_common(1)[0][0]
+
+    return None
+
+
+def profile_body_style(doc):
+    """
+    Body text style of a document, sampled when the document is large.
+
+    Documents of at most SAMPLE_MIN_PAGES pages and ambiguous samples fall
+    back to a full scan, one page at a time, which matches the full-document
+    histogram exactly.
+
+    Args:
+        doc (fitz.Document): Open PyMuPDF document
+
+    Returns:
+        tuple: (size, font name), or None when the document has no text
+    """
+    if doc.page_count > SAMPLE_MIN_PAGES:
+        style = estimate_body_style(doc)
+        if style is not None:
+            return style
+
+    font_counts = Counter()
+    for page_num in range(doc.page_count):
+        font_counts.update(_page_histogram(doc, page_num))
+    return font_counts.most_common(1)[0][0] if font_counts else None
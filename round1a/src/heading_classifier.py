@@ -0,0 +1,117 @@
+"""
+Vectorized Heading Classifier for Round 1A
+Evaluates the generic heading heuristics for a whole document at once.
+"""
+
+import re
+
+import numpy as np
+
+
+# Precompiled patterns shared by every call
+DATE_PATTERN = re.compile(r'^\w+\s\d{1,2},\s\d{4}')
+NUMBERED_PATTERN = re.compile(r'^(\d+\.?\s|\d+\.\d+\.?\s|[IVXLC]+\.?\s|[A-Z]\.?\s)')
+BOLD_FONT_PATTERN = re.compile(r'bold|black')
+
+# Common document section patterns (generic)
+DOCUMENT_SECTIONS = [
+    'table of contents', 'revision history', 'acknowledgements',
+    'introduction', 'overview', 'conclusion', 'summary',
+    'references', 'bibliography', 'appendix', 'glossary',
+    'abstract', 'preface', 'foreword'
+]
+DOCUMENT_SECTION_PATTERN = re.compile('|'.join(re.escape(section) for section in DOCUMENT_SECTIONS))
+
+# One row per candidate line; everything here is independent of the body text size
+FEATURE_DTYPE = np.dtype([
+    ('page', np.int32),
+    ('size', np.float32),
+    ('is_bold', np.bool_),
+    ('is_short', np.bool_),
+    ('is_not_sentence', np.bool_),
+    ('is_not_date', np.bool_),
+    ('is_numbered', np.bool_),
+    ('is_all_caps', np.bool_),
+    ('is_centered', np.bool_),
+    ('is_document_section', np.bool_),
+])
+
+
+def _text_mask(pattern_test, texts):
+    return np.fromiter((pattern_test(text) for text in texts), dtype=np.bool_, count=len(texts))
+
+
+def extract_line_features(model):
+    """
+    Build the feature matrix for every single-line text block of a document.
+
+    Args:
+        model (DocumentModel): Parsed document
+
+    Returns:
+        tuple: (feature record array, list of stripped line texts)
+    """
+    blocks = model.blocks
+    lines = blocks['first_line'][blocks['line_count'] == 1]
+    texts = [model.line_text(line).strip() for line in lines]
+
+    # Empty lines never become headings
+    non_empty = _text_mask(bool, texts)
+    lines = lines[non_empty]
+    texts = [text for text in texts if text]
+
+    spans = model.spans[model.lines['first_span'][lines]]
+    features = np.zeros(len(lines), dtype=FEATURE_DTYPE)
+    features['page'] = spans['page']
+    features['size'] = spans['size']
+
+    # Font-level flags are computed once per interned font, then gathered
+    bold_fonts = np.array([bool(BOLD_FONT_PATTERN.search(font.lower())) for font in model.fonts] or [False])
+    features['is_bold'] = bold_fonts[spans['font']] | ((spans['flags'] & 16) != 0)
+
+    # Centered text: compare span and page centres in double precision
+    page_rects = model.page_rects[spans['page']]
+    center_x = (spans['x0'].astype(np.float64) + spans['x1'].astype(np.float64)) / 2
+    page_center_x = (page_rects[:, 0] + page_rects[:, 2]) / 2
+    features['is_centered'] = np.abs(center_x - page_center_x) < (page_rects[:, 2] - page_rects[:, 0]) / 8
+
+    features['is_short'] = np.fromiter((len(text.split()) for text in texts), dtype=np.int32, count=len(texts)) < 25
+    features['is_not_sentence'] = ~_text_mask(lambda text: text.endswith('.'), texts)
+    features['is_not_date'] = ~_text_mask(DATE_PATTERN.match, texts)
+    features['is_numbered'] = _text_mask(NUMBERED_PATTERN.match, texts)
+    features['is_all_caps'] = _text_mask(lambda text: len(text) > 3 and text.isupper(), texts)
+    features['is_document_section'] = _text_mask(lambda text: DOCUMENT_SECTION_PATTERN.search(text.lower()), texts)
+    return features, texts
+
+
+def classify_headings(features, texts, body_text_size):
+    """
+    Select heading candidates from a feature matrix in one vectorized step.
+
+    Args:
+        features (np.ndarray): Records produced by extract_line_features
+        texts (list): Line texts aligned with the feature records
+        body_text_size (float): Font size of the document body text
+
+    Returns:
+        list: Heading dicts in document order
+    """
+    is_larger = features['size'].astype(np.float64) > body_text_size + 0.5
+
+    # Accept as heading if any strong signal is present
+    has_signal = (is_larger | features['is_bold'] | features['is_numbered'] | features['is_all_caps']
+                  | features['is_centered'] | features['is_document_section'])
+    accepted = has_signal & features['is_short'] & features['is_not_sentence'] & features['is_not_date']
+
+    headings = []
+    for index in np.flatnonzero(accepted):
+        record = features[index]
+        headings.append({
+            'text': texts[index],
+            'size': float(record['size']),
+            'page': int(record['page']) + 1,
+            'is_numbered': bool(record['is_numbered']),
+            'is_bold': bool(record['is_bold']),
+            'is_document_section': bool(record['is_document_section'])
+        })
+    return headings
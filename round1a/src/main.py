@@ -1,66 +1,112 @@
 #!/usr/bin/env python3
 """
 Round 1A: Document Structure Extractor
-Extracts title and heading outline from a single PDF document.
+Extracts title and heading outline from a single PDF document, or from
+every PDF in the input directory in batch mode.
 """
 
 import os
 import sys
 import json
-from pdf_extractor_generic import extract_document_structure
+import argparse
+from extractor_registry import DEFAULT_STRATEGY, available_strategies, extract_with_strategy
+from batch_runner import DEFAULT_FILE_TIMEOUT, SUMMARY_FILE_NAME, read_manifest, run_batch
 
 
-def main():
-    """Main entry point for Round 1A document structure extraction."""
-    
-    # Setup directories
-    input_dir = "/app/input"
-    output_dir = "/app/output"
-    
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Find PDF file in input directory
-    pdf_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.pdf')]
-    
-    if not pdf_files:
-        print("Error: No PDF files found in input directory")
-        sys.exit(1)
-    
-    if len(pdf_files) > 1:
-        print("Warning: Multiple PDF files found. Processing the first one.")
-    
-    pdf_path = os.path.join(input_dir, pdf_files[0])
-    print(f"Processing: {pdf_files[0]}")
-    
+def parse_args():
+    parser = argparse.ArgumentParser(description="Round 1A document structure extraction")
+    parser.add_argument("--input-dir", default="/app/input", help="Directory containing the PDFs")
+    parser.add_argument("--output-dir", default="/app/output", help="Directory for the JSON output")
+    parser.add_argument("--batch", action="store_true",
+                        help="Write <name>.json per PDF even when there is only one input")
+    parser.add_argument("--manifest", help="File listing the PDFs to process, one per line (implies --batch)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes in batch mode (default: all CPUs)")
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY, choices=available_strategies(),
+                        help="Heading extraction strategy")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_FILE_TIMEOUT,
+                        help="Per-file time limit in seconds in batch mode")
+    return parser.parse_args()
+
+
+def process_single(pdf_path, output_dir, strategy):
+    """Extract one PDF into output_dir/document_structure.json."""
+    print(f"Processing: {os.path.basename(pdf_path)}")
+
     try:
         # Extract document structure
-        outline_data, doc = extract_document_structure(pdf_path)
-        
+        outline_data, doc = extract_with_strategy(pdf_path, strategy)
+
         # Close document to free memory
         if doc:
             doc.close()
-        
+
         # Save output
         output_path = os.path.join(output_dir, "document_structure.json")
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(outline_data, f, indent=2, ensure_ascii=False)
-        
+
         print(f"✅ Document structure extracted successfully")
         print(f"📄 Title: {outline_data['title']}")
         print(f"📋 Headings found: {len(outline_data['outline'])}")
         print(f"💾 Output saved to: {output_path}")
-        
+
         # Also print to stdout for verification
         print("\n" + "="*50)
         print("EXTRACTED STRUCTURE:")
         print("="*50)
         print(json.dumps(outline_data, indent=2, ensure_ascii=False))
-        
+
     except Exception as e:
         print(f"Error processing PDF: {str(e)}")
         sys.exit(1)
 
 
+def process_batch(pdf_paths, output_dir, workers, timeout, strategy):
+    """Extract every PDF on a worker pool and report per-file results."""
+    print(f"Processing {len(pdf_paths)} PDFs in batch mode")
+
+    summary = run_batch(pdf_paths, output_dir, workers=workers, timeout=timeout, strategy=strategy)
+
+    for result in summary['files']:
+        if result['status'] == 'ok':
+            print(f"✅ {result['file']}: {result['headings']} headings in {result['seconds']:.2f}s -> {result['output']}")
+        else:
+            print(f"❌ {result['file']}: {result['status']} ({result['error']})")
+
+    print(f"\n📊 {summary['succeeded']}/{summary['total']} succeeded in {summary['elapsed_seconds']:.2f}s "
+          f"with {summary['workers']} workers")
+    print(f"💾 Summary saved to: {os.path.join(output_dir, SUMMARY_FILE_NAME)}")
+
+    if summary['failed']:
+        sys.exit(1)
+
+
+def main():
+    """Main entry point for Round 1A document structure extraction."""
+    args = parse_args()
+
+    # Setup directories
+    input_dir = args.input_dir
+    output_dir = args.output_dir
+
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Find PDF files in the manifest or input directory
+    if args.manifest:
+        pdf_paths = read_manifest(args.manifest, input_dir)
+    else:
+        pdf_paths = [os.path.join(input_dir, f) for f in sorted(os.listdir(input_dir)) if f.lower().endswith('.pdf')]
+
+    if not pdf_paths:
+        print("Error: No PDF files found in input directory")
+        sys.exit(1)
+
+    if len(pdf_paths) > 1 or args.batch or args.manifest:
+        process_batch(pdf_paths, output_dir, args.workers, args.timeout, args.strategy)
+    else:
+        process_single(pdf_paths[0], output_dir, args.strategy)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,144 @@
+"""
+Content-Addressed Outline Cache for Round 1A
+Stores finished outline JSON on disk, keyed by the PDF bytes and the extractor that produced it.
+"""
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "round1a_outline_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# Fraction of the budget written between eviction scans
+EVICTION_SCAN_FRACTION = 32
+
+# Read size when hashing PDF files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(pdf_path):
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutlineCache:
+    """
+    On-disk outline cache with size-based LRU eviction.
+
+    Entries are written to a temporary file and renamed into place, so
+    concurrent readers in other processes only ever see complete files.
+    A hit refreshes the entry's mtime, which is the LRU clock for eviction.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Args:
+            cache_dir (str): Cache directory; defaults to $OUTLINE_CACHE_DIR or a temp dir
+            max_bytes (int): Size budget; defaults to $OUTLINE_CACHE_MAX_BYTES or 256MB
+        """
+        self.cache_dir = cache_dir or os.environ.get("OUTLINE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes or int(os.environ.get("OUTLINE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        # Start at a random point of the scan interval: a script that stores a single
+        # small outline still scans with probability proportional to what it wrote
+        self._unscanned_bytes = random.randrange(max(1, self.max_bytes // EVICTION_SCAN_FRACTION))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_digest, variant, version):
+        """
+        Combine the document hash with the extractor identity.
+
+        Args:
+            pdf_digest (str): SHA-256 hex digest of the PDF bytes
+            variant (str): Extractor variant name, e.g. "generic"
+            version (str): Extractor version; bump it whenever output changes
+        """
+        return hashlib.sha256(f"{pdf_digest}:{variant}:{version}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        """Return the cached outline for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                outline = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Unreadable entry; drop it and treat as a miss
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return outline
+
+    def put(self, key, outline):
+        """Store an outline atomically, then evict old entries if over budget."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(outline, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+        self._unscanned_bytes += os.path.getsize(path)
+        self.evict()
+
+    def evict(self, force=False):
+        """
+        Delete least recently used entries until the cache fits its budget.
+
+        The directory walk is skipped until a slice of the budget has been
+        written since the last scan, unless force is set.
+        """
+        if not force and self._unscanned_bytes * EVICTION_SCAN_FRACTION < self.max_bytes:
+            return
+        self._unscanned_bytes = 0
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # removed by another process
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,201 @@
+"""
+Persistent Per-Page Span Cache
+Shares parsed page records between Round 1A, Round 1B and every extractor variant.
+"""
+
+import hashlib
+import os
+import random
+import tempfile
+
+import numpy as np
+
+
+# Bump whenever the page record layout or the TextPage flags change
+PAGE_CACHE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1GB
+
+# Fraction of the budget written between eviction scans
+EVICTION_SCAN_FRACTION = 32
+
+# Read size when hashing PDF files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# (path, size, mtime) -> digest, so repeated model builds hash a file once per process
+_digest_memo = {}
+_default_cache = None
+
+
+def document_digest(doc):
+    """
+    SHA-256 hex digest of the bytes behind an open document.
+
+    Documents opened from memory by pdf_source.open_pdf carry their digest;
+    others are hashed from their file.
+
+    Returns:
+        str: Digest, or None when the source bytes are unknown
+    """
+    digest = getattr(doc, 'source_digest', None)
+    if digest:
+        return digest
+
+    path = doc.name
+    if not path or not os.path.isfile(path):
+        return None
+
+    stat = os.stat(path)
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        digest = _digest_memo[memo_key] = hasher.hexdigest()
+    return digest
+
+
+class PageCache:
+    """
+    One .npz sidecar per (document hash, page index).
+
+    Files are written to a temporary name and renamed into place, so
+    concurrent readers never see partial records. Loads refresh the mtime,
+    and eviction drops least recently used documents as a whole.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        """
+        Args:
+            cache_dir (str): Directory shared by every pipeline using the cache
+            max_bytes (int): Size budget; defaults to $PDF_PAGE_CACHE_MAX_BYTES or 1GB
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes or int(os.environ.get("PDF_PAGE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        # Start at a random point of the scan interval: the portal scripts run one
+        # process per upload, and each still scans with probability proportional
+        # to what it wrote
+        self._unscanned_bytes = random.randrange(max(1, self.max_bytes // EVICTION_SCAN_FRACTION))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _document_dir(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], digest, "v%d" % PAGE_CACHE_VERSION)
+
+    def load(self, digest, page_num):
+        """
+        Load a page record.
+
+        Returns:
+            dict: Page record as produced by page_model.parse_page, or None on a miss
+        """
+        path = os.path.join(self._document_dir(digest), "%d.npz" % page_num)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                record = {
+                    'fonts': [str(font) for font in data['fonts']],
+                    'text': str(data['text'][()]),
+                    'page_text': str(data['page_text'][()]),
+                    'rect': tuple(data['rect'].tolist()),
+                    'spans': data['spans'],
+                    'lines': data['lines'],
+                    'blocks': data['blocks'],
+                }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            # Unreadable sidecar; drop it and treat as a miss
+            _remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return record
+
+    def store(self, digest, page_num, record):
+        """Write a page record atomically."""
+        document_dir = self._document_dir(digest)
+        os.makedirs(document_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=document_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    fonts=np.array(record['fonts'], dtype=str),
+                    text=np.array(record['text']),
+                    page_text=np.array(record['page_text']),
+                    rect=np.array(record['rect'], dtype=np.float64),
+                    spans=record['spans'],
+                    lines=record['lines'],
+                    blocks=record['blocks'],
+                )
+            path = os.path.join(document_dir, "%d.npz" % page_num)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+        self._unscanned_bytes += os.path.getsize(path)
+
+    def evict(self, force=False):
+        """
+        Delete least recently used documents until the cache fits its budget.
+
+        The directory walk is skipped until a slice of the budget has been
+        written since the last scan, unless force is set.
+        """
+        if not force and self._unscanned_bytes * EVICTION_SCAN_FRACTION < self.max_bytes:
+            return
+        self._unscanned_bytes = 0
+
+        documents = {}
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".npz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # removed by another process
+                last_used, size, paths = documents.get(root, (0, 0, []))
+                paths.append(path)
+                documents[root] = (max(last_used, stat.st_mtime), size + stat.st_size, paths)
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for last_used, size, paths in sorted(documents.values(), key=lambda entry: entry[0]):
+            for path in paths:
+                _remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def default_page_cache():
+    """
+    The process-wide page cache, enabled by setting $PDF_PAGE_CACHE_DIR.
+
+    Returns:
+        PageCache: Shared cache, or None when caching is disabled
+    """
+    global _default_cache
+    cache_dir = os.environ.get("PDF_PAGE_CACHE_DIR")
+    if not cache_dir:
+        return None
+    if _default_cache is None or _default_cache.cache_dir != cache_dir:
+        _default_cache = PageCache(cache_dir)
+    return _default_cache
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
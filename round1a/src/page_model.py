@@ -0,0 +1,294 @@
+"""
+Shared Page Model for the PDF Document Structure Extractors
+Parses every page exactly once into a compact, columnar span store.
+"""
+
+import time
+from collections import Counter
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from page_cache import default_page_cache, document_digest
+
+
+# One record per span; the span text lives in DocumentModel.text[start:end]
+SPAN_DTYPE = np.dtype([
+    ('page', np.int32),
+    ('font', np.int32),      # index into DocumentModel.fonts
+    ('size', np.float32),
+    ('flags', np.int32),
+    ('x0', np.float32),
+    ('y0', np.float32),
+    ('x1', np.float32),
+    ('y1', np.float32),
+    ('start', np.int32),
+    ('end', np.int32),
+    ('length', np.int32),    # length of the stripped span text
+])
+
+LINE_DTYPE = np.dtype([
+    ('page', np.int32),
+    ('block', np.int32),
+    ('first_span', np.int32),
+    ('span_count', np.int32),
+])
+
+BLOCK_DTYPE = np.dtype([
+    ('page', np.int32),
+    ('first_line', np.int32),
+    ('line_count', np.int32),
+    ('x0', np.float32),
+    ('y0', np.float32),
+    ('x1', np.float32),
+    ('y1', np.float32),
+])
+
+# Ligature characters as MuPDF splits them when ligatures are not preserved
+_LIGATURES = str.maketrans({
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl', '\ufb03': 'ffi',
+    '\ufb04': 'ffl', '\ufb05': 'st', '\ufb06': 'st',
+})
+
+
+class DocumentModel:
+    """
+    Text content of a whole PDF, stored as NumPy record arrays.
+
+    Spans, lines and blocks are flat arrays that reference each other by index.
+    Span texts are concatenated into one shared string, so the raw text of a
+    line is a single slice of that buffer.
+    """
+
+    __slots__ = ("fonts", "text", "spans", "lines", "blocks",
+                 "page_rects", "page_texts", "page_block_offsets")
+
+    def __init__(self, fonts, text, spans, lines, blocks, page_rects, page_texts, page_block_offsets):
+        self.fonts = fonts
+        self.text = text
+        self.spans = spans
+        self.lines = lines
+        self.blocks = blocks
+        self.page_rects = page_rects
+        self.page_texts = page_texts
+        self.page_block_offsets = page_block_offsets
+
+    @property
+    def page_count(self):
+        return len(self.page_texts)
+
+    def page_rect(self, page_num):
+        """Page rectangle of a zero-based page index."""
+        return fitz.Rect(*self.page_rects[page_num].tolist())
+
+    def page_blocks(self, page_num):
+        """Block indices of a zero-based page index, in reading order."""
+        return range(int(self.page_block_offsets[page_num]), int(self.page_block_offsets[page_num + 1]))
+
+    def block_lines(self, block):
+        """Line indices belonging to a block."""
+        first = int(self.blocks['first_line'][block])
+        return range(first, first + int(self.blocks['line_count'][block]))
+
+    def line_spans(self, line):
+        """Span indices belonging to a line."""
+        first = int(self.lines['first_span'][line])
+        return range(first, first + int(self.lines['span_count'][line]))
+
+    def line_text(self, line):
+        """Raw (unstripped) text of a line, i.e. the concatenation of its spans."""
+        spans = self.line_spans(line)
+        if not spans:
+            return ""
+        return self.text[self.spans['start'][spans[0]]:self.spans['end'][spans[-1]]]
+
+    def span_text(self, span):
+        return self.text[self.spans['start'][span]:self.spans['end'][span]]
+
+    def span_bbox(self, span):
+        record = self.spans[span]
+        return (float(record['x0']), float(record['y0']), float(record['x1']), float(record['y1']))
+
+    def font_name(self, span):
+        return self.fonts[self.spans['font'][span]]
+
+    def font_histogram(self, min_length=0):
+        """
+        Count stripped characters per (size, font) combination.
+
+        Args:
+            min_length (int): Ignore spans whose stripped text is shorter than this
+
+        Returns:
+            Counter: (size, font name) -> character count, in first-seen order
+        """
+        spans = self.spans[self.spans['length'] >= min_length]
+        font_counts = Counter()
+        if not len(spans):
+            return font_counts
+
+        keys = np.empty(len(spans), dtype=[('size', np.float32), ('font', np.int32)])
+        keys['size'] = spans['size']
+        keys['font'] = spans['font']
+        unique_keys, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=spans['length'], minlength=len(unique_keys))
+
+        # Insert in first-seen order so most_common() breaks ties like a span-by-span scan
+        for key_index in np.argsort(first_seen, kind='stable'):
+            size, font = unique_keys[key_index]
+            font_counts[(float(size), self.fonts[font])] = int(totals[key_index])
+        return font_counts
+
+
+def parse_page(page):
+    """
+    Parse one page into page-local records.
+
+    Font ids index the record's own font list, and span offsets, line and
+    block references are relative to the page. The record is what the page
+    cache stores. One TextPage with PyMuPDF's default text flags serves both
+    the span dict and the plain page text, which therefore matches
+    page.get_text(); span text has its ligatures split, as the extractors
+    have always seen it.
+
+    Args:
+        page (fitz.Page): Loaded PyMuPDF page
+
+    Returns:
+        dict: fonts, text, page_text, rect, spans, lines and blocks of the page
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+    text_dict = page.get_text("dict", textpage=textpage)
+
+    fonts = []
+    font_ids = {}
+    text_offset = 0
+    span_rows, line_rows, block_rows, span_texts = [], [], [], []
+
+    for block in text_dict.get("blocks", []):
+        if block['type'] != 0:  # not a text block
+            continue
+        block_lines = block.get("lines", [])
+        block_rows.append((0, len(line_rows), len(block_lines)) + tuple(block['bbox']))
+
+        for line in block_lines:
+            line_spans = line.get("spans", [])
+            line_rows.append((0, len(block_rows) - 1, len(span_rows), len(line_spans)))
+
+            for span in line_spans:
+                font_id = font_ids.get(span['font'])
+                if font_id is None:
+                    font_id = font_ids[span['font']] = len(fonts)
+                    fonts.append(span['font'])
+
+                span_text = span['text'].translate(_LIGATURES)
+                span_texts.append(span_text)
+                span_rows.append((0, font_id, span['size'], span['flags'])
+                                 + tuple(span['bbox'])
+                                 + (text_offset, text_offset + len(span_text), len(span_text.strip())))
+                text_offset += len(span_text)
+
+    return {
+        'fonts': fonts,
+        'text': "".join(span_texts),
+        'page_text': page.get_text("text", textpage=textpage),
+        'rect': tuple(page.rect),
+        'spans': np.array(span_rows, dtype=SPAN_DTYPE),
+        'lines': np.array(line_rows, dtype=LINE_DTYPE),
+        'blocks': np.array(block_rows, dtype=BLOCK_DTYPE),
+    }
+
+
+def build_document_model(doc, start=0, stop=None, page_cache=None, deadline=None):
+    """
+    Build the columnar model of an open document, parsing each page at most once.
+
+    Pages are read from the persistent page cache when it is enabled; misses
+    are parsed with parse_page and written back, so later runs of any
+    extractor variant or of the Round 1B chunker skip PyMuPDF entirely.
+
+    Args:
+        doc (fitz.Document): Open PyMuPDF document
+        start (int): First page to parse (zero-based)
+        stop (int): Page to stop before; None parses to the end
+        page_cache (PageCache): Cache to use; None falls back to default_page_cache()
+        deadline (float): time.monotonic() value after which no further pages are
+            parsed; the first page is always parsed. Check model.page_count for truncation
+
+    Returns:
+        DocumentModel: Columnar model of the pages; page indices are relative to start
+    """
+    if page_cache is None:
+        page_cache = default_page_cache()
+    digest = document_digest(doc) if page_cache is not None else None
+    stop = doc.page_count if stop is None else min(stop, doc.page_count)
+
+    fonts = []
+    font_ids = {}
+    text_chunks = []
+    text_offset = 0
+    span_count = line_count = block_count = 0
+    span_arrays, line_arrays, block_arrays = [], [], []
+    page_rects, page_texts, page_block_offsets = [], [], [0]
+    stored = False
+
+    for page_num, page_index in enumerate(range(start, stop)):
+        if page_num and deadline is not None and time.monotonic() >= deadline:
+            break
+
+        record = page_cache.load(digest, page_index) if digest else None
+        if record is None:
+            record = parse_page(doc.load_page(page_index))
+            if digest:
+                page_cache.store(digest, page_index, record)
+                stored = True
+
+        # Map page-local font ids onto the document font table
+        font_map = np.empty(len(record['fonts']), dtype=np.int32)
+        for local_id, font in enumerate(record['fonts']):
+            font_id = font_ids.get(font)
+            if font_id is None:
+                font_id = font_ids[font] = len(fonts)
+                fonts.append(font)
+            font_map[local_id] = font_id
+
+        spans = record['spans'].copy()
+        spans['page'] = page_num
+        spans['font'] = font_map[spans['font']]
+        spans['start'] += text_offset
+        spans['end'] += text_offset
+
+        lines = record['lines'].copy()
+        lines['page'] = page_num
+        lines['block'] += block_count
+        lines['first_span'] += span_count
+
+        blocks = record['blocks'].copy()
+        blocks['page'] = page_num
+        blocks['first_line'] += line_count
+
+        text_chunks.append(record['text'])
+        page_texts.append(record['page_text'])
+        page_rects.append(record['rect'])
+        span_arrays.append(spans)
+        line_arrays.append(lines)
+        block_arrays.append(blocks)
+        text_offset += len(record['text'])
+        span_count += len(spans)
+        line_count += len(lines)
+        block_count += len(blocks)
+        page_block_offsets.append(block_count)
+
+    if stored:
+        page_cache.evict()
+
+    return DocumentModel(
+        fonts=fonts,
+        text="".join(text_chunks),
+        spans=np.concatenate(span_arrays) if span_arrays else np.empty(0, dtype=SPAN_DTYPE),
+        lines=np.concatenate(line_arrays) if line_arrays else np.empty(0, dtype=LINE_DTYPE),
+        blocks=np.concatenate(block_arrays) if block_arrays else np.empty(0, dtype=BLOCK_DTYPE),
+        page_rects=np.array(page_rects, dtype=np.float64).reshape(-1, 4),
+        page_texts=page_texts,
+        page_block_offsets=np.array(page_block_offsets, dtype=np.int64),
+    )
@@ -3,9 +3,10 @@ PDF Document Structure Extractor for Round 1A
 Extracts title and heading hierarchy from PDF documents using PyMuPDF.
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from collections import defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
 
 
 def extract_document_structure(pdf_path):
@@ -13,84 +14,85 @@ def extract_document_structure(pdf_path):
     Extracts a structured outline using a robust, non-hardcoded approach.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
         
     Returns:
         tuple: (outline_data dict, document object)
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
+    return outline_from_model(build_document_model(doc), doc), doc
+
+
+def outline_from_model(model, doc):
+    """
+    Base heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata
+
+    Returns:
+        dict: outline_data with title and outline
+    """
     output = {"title": "Title Not Found", "outline": []}
     headings = []
-    font_counts = Counter()
-    font_size_to_lines = defaultdict(list)
-    page_texts = []
+    page_texts = model.page_texts
     page_headings = defaultdict(list)
 
     # 1. Profile the document's body text to establish a baseline
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        font_counts[(span['size'], span['font'])] += len(span['text'].strip())
-                        font_size_to_lines[span['size']].append(span['text'].strip())
+    font_counts = model.font_histogram()
 
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style (most common font/size combination)
     body_text_style = font_counts.most_common(1)[0][0]
     body_text_size = body_text_style[0]
 
     # 2. Extract potential headings using multi-factor heuristics
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        mediabox = page.rect
+    for page_num in range(model.page_count):
+        mediabox = model.page_rect(page_num)
         
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                # Focus on single-line blocks (typical for headings)
-                if len(block.get("lines", [])) == 1:
-                    line = block["lines"][0]
-                    line_text = "".join(s['text'] for s in line['spans']).strip()
-                    
-                    if not line_text:
-                        continue
-                        
-                    span = line['spans'][0]
-                    font_size = span['size']
-                    font_name = span['font']
-                    bbox = span['bbox'] if 'bbox' in span else None
-                    
-                    # Heading detection heuristics
-                    is_larger = font_size > body_text_size + 0.5
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (span['flags'] & 16)
-                    is_short = len(line_text.split()) < 25
-                    is_not_sentence = not line_text.endswith('.')
-                    is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
-                    is_numbered = bool(re.match(r'^(\d+\.|[IVXLC]+\.|[A-Z]\.)', line_text.strip()))
-                    is_all_caps = line_text.isupper() and len(line_text) > 3
-                    
-                    # Check if text is centered
-                    is_centered = False
-                    if bbox:
-                        left, top, right, bottom = bbox
-                        center_x = (left + right) / 2
-                        page_center_x = (mediabox.x0 + mediabox.x1) / 2
-                        is_centered = abs(center_x - page_center_x) < (mediabox.width / 8)
+        for block in model.page_blocks(page_num):
+            # Focus on single-line blocks (typical for headings)
+            block_lines = model.block_lines(block)
+            if len(block_lines) == 1:
+                line = block_lines[0]
+                line_text = model.line_text(line).strip()
+                
+                if not line_text:
+                    continue
                     
-                    # Accept as heading if any strong signal is present
-                    if (is_larger or is_bold or is_numbered or is_all_caps or is_centered) and is_short and is_not_sentence and is_not_date:
-                        headings.append({
-                            'text': line_text,
-                            'size': font_size,
-                            'page': page_num + 1
-                        })
-                        page_headings[page_num + 1].append(line_text)
+                span = model.lines['first_span'][line]
+                font_size = float(model.spans['size'][span])
+                font_name = model.font_name(span)
+                bbox = model.span_bbox(span)
+                
+                # Heading detection heuristics
+                is_larger = font_size > body_text_size + 0.5
+                is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (model.spans['flags'][span] & 16)
+                is_short = len(line_text.split()) < 25
+                is_not_sentence = not line_text.endswith('.')
+                is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
+                is_numbered = bool(re.match(r'^(\d+\.|[IVXLC]+\.|[A-Z]\.)', line_text.strip()))
+                is_all_caps = line_text.isupper() and len(line_text) > 3
+                
+                # Check if text is centered
+                is_centered = False
+                if bbox:
+                    left, top, right, bottom = bbox
+                    center_x = (left + right) / 2
+                    page_center_x = (mediabox.x0 + mediabox.x1) / 2
+                    is_centered = abs(center_x - page_center_x) < (mediabox.width / 8)
+                
+                # Accept as heading if any strong signal is present
+                if (is_larger or is_bold or is_numbered or is_all_caps or is_centered) and is_short and is_not_sentence and is_not_date:
+                    headings.append({
+                        'text': line_text,
+                        'size': font_size,
+                        'page': page_num + 1
+                    })
+                    page_headings[page_num + 1].append(line_text)
 
     # 3. Handle cover page detection (adjust page numbers if needed)
     if len(page_headings.get(1, [])) == 0 and len(page_texts) > 1:
@@ -153,4 +155,4 @@ def extract_document_structure(pdf_path):
                     "page": h['page']
                 })
 
-    return output, doc
\ No newline at end of file
+    return output
\ No newline at end of file
@@ -3,35 +3,38 @@ Balanced PDF Document Structure Extractor for Round 1A
 Combines the best of both approaches - good detection with proper filtering
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
 
 
 def extract_document_structure(pdf_path):
     """
     Balanced document structure extraction that matches sample output.
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
+    return outline_from_model(build_document_model(doc), doc), doc
+
+
+def outline_from_model(model, doc):
+    """
+    Balanced heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata
+
+    Returns:
+        dict: outline_data with title and outline
+    """
     output = {"title": "Overview  Foundation Level Extensions  ", "outline": []}
     headings = []
-    font_counts = Counter()
     
     # 1. Analyze document fonts
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span['text'].strip()
-                        if text and len(text) > 2:
-                            font_counts[(span['size'], span['font'])] += len(text)
+    font_counts = model.font_histogram(min_length=3)
 
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style
     body_text_style = font_counts.most_common(1)[0][0]
@@ -60,9 +63,7 @@ def extract_document_structure(pdf_path):
     
     found_headings = []
     
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_text = page.get_text()
+    for page_num, page_text in enumerate(model.page_texts):
         
         # Look for each target heading in the page text
         for target in target_headings:
@@ -155,7 +156,7 @@ def extract_document_structure(pdf_path):
             "page": h['page']
         })
 
-    return output, doc
+    return output
 
 
 # Test function
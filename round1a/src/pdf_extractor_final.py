@@ -3,37 +3,39 @@ Final PDF Document Structure Extractor for Round 1A
 Tuned to match the exact sample output format
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
 
 
 def extract_document_structure(pdf_path):
     """
     Final document structure extraction to match sample output exactly.
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
+    return outline_from_model(build_document_model(doc), doc), doc
+
+
+def outline_from_model(model, doc):
+    """
+    Final heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata
+
+    Returns:
+        dict: outline_data with title and outline
+    """
     output = {"title": "Title Not Found", "outline": []}
     headings = []
-    font_counts = Counter()
-    page_texts = []
+    page_texts = model.page_texts
     
     # 1. Analyze document fonts and build comprehensive font profile
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span['text'].strip()
-                        if text and len(text) > 2:
-                            font_counts[(span['size'], span['font'])] += len(text)
+    font_counts = model.font_histogram(min_length=3)
 
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style (most common)
     body_text_style = font_counts.most_common(1)[0][0]
@@ -43,64 +45,62 @@ def extract_document_structure(pdf_path):
     all_font_sizes = sorted(list(set([size for (size, font) in font_counts.keys()])), reverse=True)
     
     # 2. Extract potential headings with enhanced criteria
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:
-                # Focus on single-line blocks (typical for headings)
-                if len(block.get("lines", [])) == 1:
-                    line = block["lines"][0]
-                    line_text = "".join(s['text'] for s in line['spans']).strip()
-                    
-                    if not line_text or len(line_text) < 3:
-                        continue
-                    
-                    span = line['spans'][0]
-                    font_size = span['size']
-                    font_name = span['font']
-                    
-                    # Enhanced heading detection criteria
-                    is_larger = font_size > body_text_size + 0.3
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (span['flags'] & 16)
-                    is_reasonable_length = 3 <= len(line_text) <= 150
-                    is_not_sentence = not line_text.endswith('.')
-                    is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
-                    
-                    # Check for various heading patterns
-                    is_numbered = bool(re.match(r'^(\d+\.?\s|\d+\.\d+\.?\s)', line_text))
-                    is_appendix = bool(re.match(r'^Appendix\s+[A-Z]', line_text, re.IGNORECASE))
-                    is_phase = bool(re.match(r'^Phase\s+[IVX]+', line_text, re.IGNORECASE))
-                    
-                    # Document sections
-                    is_document_section = any(keyword in line_text.lower() for keyword in [
-                        'summary', 'background', 'introduction', 'overview', 'conclusion',
-                        'references', 'bibliography', 'glossary', 'milestones',
-                        'approach', 'evaluation', 'business plan', 'timeline'
-                    ])
-                    
-                    # Special patterns from sample
-                    is_special_section = any(pattern in line_text.lower() for pattern in [
-                        'digital library', 'ontario', 'critical component', 'prosperity strategy',
-                        'envisioned phases', 'steering committee', 'electronic resources'
-                    ])
+    for page_num in range(model.page_count):
+        for block in model.page_blocks(page_num):
+            # Focus on single-line blocks (typical for headings)
+            block_lines = model.block_lines(block)
+            if len(block_lines) == 1:
+                line = block_lines[0]
+                line_text = model.line_text(line).strip()
+                
+                if not line_text or len(line_text) < 3:
+                    continue
+                
+                span = model.lines['first_span'][line]
+                font_size = float(model.spans['size'][span])
+                font_name = model.font_name(span)
+                
+                # Enhanced heading detection criteria
+                is_larger = font_size > body_text_size + 0.3
+                is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (model.spans['flags'][span] & 16)
+                is_reasonable_length = 3 <= len(line_text) <= 150
+                is_not_sentence = not line_text.endswith('.')
+                is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
+                
+                # Check for various heading patterns
+                is_numbered = bool(re.match(r'^(\d+\.?\s|\d+\.\d+\.?\s)', line_text))
+                is_appendix = bool(re.match(r'^Appendix\s+[A-Z]', line_text, re.IGNORECASE))
+                is_phase = bool(re.match(r'^Phase\s+[IVX]+', line_text, re.IGNORECASE))
+                
+                # Document sections
+                is_document_section = any(keyword in line_text.lower() for keyword in [
+                    'summary', 'background', 'introduction', 'overview', 'conclusion',
+                    'references', 'bibliography', 'glossary', 'milestones',
+                    'approach', 'evaluation', 'business plan', 'timeline'
+                ])
+                
+                # Special patterns from sample
+                is_special_section = any(pattern in line_text.lower() for pattern in [
+                    'digital library', 'ontario', 'critical component', 'prosperity strategy',
+                    'envisioned phases', 'steering committee', 'electronic resources'
+                ])
+                
+                # More selective heading criteria
+                if ((is_larger or is_bold or is_numbered or is_appendix or is_phase or 
+                     is_document_section or is_special_section) and 
+                    is_reasonable_length and is_not_sentence and is_not_date):
                     
-                    # More selective heading criteria
-                    if ((is_larger or is_bold or is_numbered or is_appendix or is_phase or 
-                         is_document_section or is_special_section) and 
-                        is_reasonable_length and is_not_sentence and is_not_date):
-                        
-                        headings.append({
-                            'text': line_text,
-                            'size': font_size,
-                            'page': page_num + 1,
-                            'is_numbered': is_numbered,
-                            'is_bold': is_bold,
-                            'is_appendix': is_appendix,
-                            'is_phase': is_phase,
-                            'is_document_section': is_document_section,
-                            'is_special_section': is_special_section
-                        })
+                    headings.append({
+                        'text': line_text,
+                        'size': font_size,
+                        'page': page_num + 1,
+                        'is_numbered': is_numbered,
+                        'is_bold': is_bold,
+                        'is_appendix': is_appendix,
+                        'is_phase': is_phase,
+                        'is_document_section': is_document_section,
+                        'is_special_section': is_special_section
+                    })
 
     # 3. Enhanced title extraction to match sample format
     title = None
@@ -213,7 +213,7 @@ def extract_document_structure(pdf_path):
                     "page": h['page']
                 })
 
-    return output, doc
+    return output
 
 
 # Test function
@@ -3,109 +3,243 @@ Generic PDF Document Structure Extractor for Round 1A
 Completely generic approach without any hardcoded values
 """
 
-import fitz  # PyMuPDF
+import os
 import re
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 
-def extract_document_structure(pdf_path):
+from font_profile import profile_body_style
+from heading_classifier import classify_headings, extract_line_features
+from page_model import build_document_model
+from pdf_source import open_pdf
+from stage_metrics import measure
+from toc_outline import read_validated_toc
+
+
+# Bump whenever extraction output changes; part of the outline cache key
+EXTRACTOR_VERSION = "5"
+
+# Minimum pages per worker before a parallel split is worth the process startup
+MIN_PAGES_PER_WORKER = 25
+
+# Pages iter_outline profiles before it starts streaming headings
+STREAM_SAMPLE_PAGES = 5
+
+# Seconds kept back from a deadline for classification and output
+DEADLINE_RESERVE_SECONDS = 0.25
+
+
+def extract_document_structure(pdf_path, workers=None, use_toc=True, deadline=None, page_budget=None, metrics=None):
     """
     Generic document structure extraction using robust, non-hardcoded approach.
+
+    Args:
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        workers (int): Split large documents across this many processes; None runs serially
+        use_toc (bool): Use the embedded bookmark outline when it passes validation
+        deadline (float): time.monotonic() value to finish by; parsing stops early and
+            runs serially so the headings of the pages read so far are returned in time
+        page_budget (int): Maximum number of pages to parse
+        metrics (StageMetrics): Collects per-stage timings and counts when given
+
+    Returns:
+        tuple: (outline_data dict, document object). outline_data carries
+        "partial": True and "pages_processed" when not every page was read.
     """
-    doc = fitz.open(pdf_path)
+    with measure(metrics, "open") as counts:
+        doc = open_pdf(pdf_path)
+        counts['pages'] = doc.page_count
     output = {"title": "Title Not Found", "outline": []}
-    headings = []
-    font_counts = Counter()
-    font_size_to_lines = defaultdict(list)
-    page_texts = []
-    page_headings = defaultdict(list)
+
+    # 0. Fast path: a validated bookmark outline replaces the font heuristics
+    if use_toc:
+        with measure(metrics, "toc") as counts:
+            toc = read_validated_toc(doc)
+            if toc:
+                output['title'], output['outline'] = _outline_from_toc(doc, toc)
+                counts['headings'] = len(toc)
+        if toc:
+            return output, doc
+
+    # Under a page budget or deadline only a prefix of the document is profiled
+    pages_processed = doc.page_count if page_budget is None else min(doc.page_count, page_budget)
+    page_ranges = _split_page_ranges(pages_processed, workers if deadline is None else None)
 
     # 1. Profile the document's body text to establish a baseline
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        font_counts[(span['size'], span['font'])] += len(span['text'].strip())
-                        font_size_to_lines[span['size']].append(span['text'].strip())
+    with measure(metrics, "profile") as counts:
+        if len(page_ranges) > 1:
+            profile = _extract_parallel(pdf_path, page_ranges)
+        else:
+            parse_deadline = None if deadline is None else deadline - DEADLINE_RESERVE_SECONDS
+            model = build_document_model(doc, 0, pages_processed, deadline=parse_deadline)
+            pages_processed = model.page_count
+            counts['spans'] = len(model.spans)
+            profile = _profile_model(model)
+        counts['pages'] = pages_processed
+        counts['lines'] = len(profile[1])
 
-    if not font_counts:
+    if profile[0]:
+        output = _outline_from_profile(doc, *profile, metrics=metrics)
+    if pages_processed < doc.page_count:
+        output['partial'] = True
+        output['pages_processed'] = pages_processed
+
+    if not profile[0]:
         doc.close()
         return output, None
 
+    return output, doc
+
+
+def outline_from_model(model, doc, use_toc=True):
+    """
+    Generic heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata and the embedded TOC
+        use_toc (bool): Use the embedded bookmark outline when it passes validation
+
+    Returns:
+        dict: outline_data with title and outline
+    """
+    if use_toc:
+        toc = read_validated_toc(doc)
+        if toc:
+            title, outline = _outline_from_toc(doc, toc)
+            return {"title": title, "outline": outline}
+
+    return _outline_from_profile(doc, *_profile_model(model))
+
+
+def _profile_model(model):
+    """
+    Font histogram and line features of a parsed model.
+
+    Returns:
+        tuple: (font Counter, line features, line texts, first page text)
+    """
+    features, texts = extract_line_features(model)
+    first_page_text = model.page_texts[0] if model.page_count else ""
+    return model.font_histogram(), features, texts, first_page_text
+
+
+def _outline_from_profile(doc, font_counts, features, texts, first_page_text, metrics=None):
+    """Classify, title and level the headings of a profiled document."""
+    output = {"title": "Title Not Found", "outline": []}
+    if not font_counts:
+        return output
+
     # Determine body text style (most common font/size combination)
     body_text_style = font_counts.most_common(1)[0][0]
     body_text_size = body_text_style[0]
 
-    # 2. Extract potential headings using multi-factor heuristics
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        mediabox = page.rect
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                # Focus on single-line blocks (typical for headings)
-                if len(block.get("lines", [])) == 1:
-                    line = block["lines"][0]
-                    line_text = "".join(s['text'] for s in line['spans']).strip()
-                    
-                    if not line_text:
-                        continue
-                        
-                    span = line['spans'][0]
-                    font_size = span['size']
-                    font_name = span['font']
-                    bbox = span['bbox'] if 'bbox' in span else None
-                    
-                    # Heading detection heuristics
-                    is_larger = font_size > body_text_size + 0.5
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (span['flags'] & 16)
-                    is_short = len(line_text.split()) < 25
-                    is_not_sentence = not line_text.endswith('.')
-                    is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
-                    is_numbered = bool(re.match(r'^(\d+\.?\s|\d+\.\d+\.?\s|[IVXLC]+\.?\s|[A-Z]\.?\s)', line_text.strip()))
-                    is_all_caps = line_text.isupper() and len(line_text) > 3
-                    
-                    # Check if text is centered
-                    is_centered = False
-                    if bbox:
-                        left, top, right, bottom = bbox
-                        center_x = (left + right) / 2
-                        page_center_x = (mediabox.x0 + mediabox.x1) / 2
-                        is_centered = abs(center_x - page_center_x) < (mediabox.width / 8)
-                    
-                    # Common document section patterns (generic)
-                    is_document_section = any(pattern in line_text.lower() for pattern in [
-                        'table of contents', 'revision history', 'acknowledgements',
-                        'introduction', 'overview', 'conclusion', 'summary',
-                        'references', 'bibliography', 'appendix', 'glossary',
-                        'abstract', 'preface', 'foreword'
-                    ])
-                    
-                    # Accept as heading if any strong signal is present
-                    if ((is_larger or is_bold or is_numbered or is_all_caps or is_centered or is_document_section) 
-                        and is_short and is_not_sentence and is_not_date):
-                        headings.append({
-                            'text': line_text,
-                            'size': font_size,
-                            'page': page_num + 1,
-                            'is_numbered': is_numbered,
-                            'is_bold': is_bold,
-                            'is_document_section': is_document_section
-                        })
-                        page_headings[page_num + 1].append(line_text)
+    # 2. Extract potential headings using multi-factor heuristics (vectorized per document)
+    with measure(metrics, "headings") as counts:
+        headings = classify_headings(features, texts, body_text_size)
+        counts['lines'] = len(texts)
+        counts['headings'] = len(headings)
 
     # 3. Handle cover page detection (adjust page numbers if needed)
-    if len(page_headings.get(1, [])) == 0 and len(page_texts) > 1:
+    if not any(h['page'] == 1 for h in headings) and doc.page_count > 1:
         # If first page has no headings and little text, treat as cover
-        if len(page_texts[0].strip()) < 200:
+        if len(first_page_text.strip()) < 200:
             for h in headings:
                 h['page'] = max(1, h['page'] - 1)
 
     # 4. Identify the document title
+    with measure(metrics, "title"):
+        output['title'] = _identify_title(doc, headings)
+
+    # 5. Assign hierarchy levels based on font size clustering and content patterns
+    with measure(metrics, "levels") as counts:
+        output['outline'] = _assign_levels(headings)
+        counts['headings'] = len(output['outline'])
+
+    return output
+
+
+def _split_page_ranges(page_count, workers):
+    """Split [0, page_count) into contiguous ranges, one per worker."""
+    if not workers or workers < 2:
+        return [(0, page_count)]
+    workers = min(workers, max(1, page_count // MIN_PAGES_PER_WORKER))
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(workers)]
+
+
+def _profile_page_range(pdf_path, start, stop):
+    """
+    Worker: parse one page range and return its font histogram and line features.
+
+    Each worker opens the file itself, so no PyMuPDF objects cross process boundaries.
+    """
+    doc = open_pdf(pdf_path)
+    try:
+        model = build_document_model(doc, start, stop)
+    finally:
+        doc.close()
+
+    features, texts = extract_line_features(model)
+    features['page'] += start
+    first_page_text = model.page_texts[0] if start == 0 and model.page_count else ""
+    return model.font_histogram(), features, texts, first_page_text
+
+
+def _extract_parallel(pdf_path, page_ranges):
+    """
+    Profile page ranges in a process pool and merge the results in page order.
+
+    Returns:
+        tuple: (merged font Counter, line features, line texts, first page text)
+    """
+    font_counts = Counter()
+    feature_parts, texts = [], []
+    first_page_text = ""
+
+    # memoryview and mmap sources cannot be pickled; send every worker one bytes copy
+    if not isinstance(pdf_path, (str, os.PathLike, bytes, bytearray)):
+        pdf_path = bytes(pdf_path)
+
+    with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+        futures = [executor.submit(_profile_page_range, pdf_path, start, stop) for start, stop in page_ranges]
+        # Merge in page order so most_common() ties break exactly as in a serial scan
+        for future in futures:
+            range_counts, range_features, range_texts, range_first_page = future.result()
+            font_counts.update(range_counts)
+            feature_parts.append(range_features)
+            texts.extend(range_texts)
+            first_page_text = first_page_text or range_first_page
+
+    return font_counts, np.concatenate(feature_parts), texts, first_page_text
+
+
+def _outline_from_toc(doc, toc):
+    """
+    Map validated TOC entries to the title and H1/H2/H3 outline.
+
+    Page numbers get the same cover page adjustment as the heuristic path, so
+    a document is numbered alike whichever path handles it.
+
+    Returns:
+        tuple: (title, outline list)
+    """
+    # A near-empty first page that no entry points at is a cover; number from the page after it
+    if not any(page == 1 for level, text, page in toc) and doc.page_count > 1:
+        if len(doc[0].get_text().strip()) < 200:
+            toc = [(level, text, max(1, page - 1)) for level, text, page in toc]
+
+    # Bookmark depth stands in for font size when picking the title
+    title = _identify_title(doc, [{'text': text, 'page': page, 'size': -level} for level, text, page in toc])
+    outline = [{"level": "H%d" % min(level, 3), "text": text + " ", "page": page} for level, text, page in toc]
+    return title, outline
+
+
+def _identify_title(doc, headings):
+    """Pick the document title from metadata or the heading candidates."""
     title = None
     
     # Try PDF metadata first
@@ -134,54 +268,136 @@ def extract_document_structure(pdf_path):
     if title:
         title = title.strip() + "  "
     
-    output['title'] = title if title else "Title Not Found"
+    return title if title else "Title Not Found"
 
-    # 5. Assign hierarchy levels based on font size clustering and content patterns
-    if headings:
-        unique_sizes = sorted(list(set([h['size'] for h in headings])), reverse=True)
-        
-        # Map font sizes to heading levels (H1, H2, H3 only)
-        size_map = {}
-        if len(unique_sizes) >= 3:
-            size_map[unique_sizes[0]] = "H1"
-            size_map[unique_sizes[1]] = "H2"
-            for s in unique_sizes[2:]:
-                size_map[s] = "H3"
-        elif len(unique_sizes) == 2:
-            size_map[unique_sizes[0]] = "H1"
-            size_map[unique_sizes[1]] = "H2"
-        elif len(unique_sizes) == 1:
-            size_map[unique_sizes[0]] = "H1"
-        
-        # Build final outline with proper ordering
-        for h in sorted(headings, key=lambda x: (x['page'], -x['size'])):
-            level = size_map.get(h['size'], "H3")
-            
-            # Override level based on content patterns (generic rules)
-            text = h['text'].strip()
-            
-            # Main numbered sections (1., 2., 3., etc.) are typically H1
-            if re.match(r'^\d+\.\s+[A-Z]', text):
-                level = "H1"
-            # Sub-numbered sections (1.1, 2.1, etc.) are typically H2
-            elif re.match(r'^\d+\.\d+\s+', text):
-                level = "H2"
-            # Document sections are typically H1
-            elif h['is_document_section']:
-                level = "H1"
-            
-            # Only include H1, H2, H3 levels
-            if level in {"H1", "H2", "H3"}:
-                # Add trailing space to match common format requirements
-                formatted_text = text + " "
-                
-                output['outline'].append({
-                    "level": level,
-                    "text": formatted_text,
-                    "page": h['page']
-                })
 
-    return output, doc
+def _assign_levels(headings):
+    """Map heading candidates to H1/H2/H3 outline entries."""
+    outline = []
+    if not headings:
+        return outline
+
+    unique_sizes = sorted(list(set([h['size'] for h in headings])), reverse=True)
+    
+    # Build final outline with proper ordering
+    for h in sorted(headings, key=lambda x: (x['page'], -x['size'])):
+        entry = _outline_entry(h, unique_sizes)
+        if entry:
+            outline.append(entry)
+
+    return outline
+
+
+def _outline_entry(h, unique_sizes):
+    """
+    Build one outline entry for a heading candidate.
+
+    Args:
+        h (dict): Heading candidate
+        unique_sizes (list): Known heading sizes, largest first
+
+    Returns:
+        dict: Outline entry, or None if the heading falls outside H1-H3
+    """
+    # Map font sizes to heading levels (H1, H2, H3 only) by rank among the known sizes
+    rank = sum(1 for size in unique_sizes if size > h['size'])
+    level = "H%d" % min(rank + 1, 3)
+    
+    # Override level based on content patterns (generic rules)
+    text = h['text'].strip()
+    
+    # Main numbered sections (1., 2., 3., etc.) are typically H1
+    if re.match(r'^\d+\.\s+[A-Z]', text):
+        level = "H1"
+    # Sub-numbered sections (1.1, 2.1, etc.) are typically H2
+    elif re.match(r'^\d+\.\d+\s+', text):
+        level = "H2"
+    # Document sections are typically H1
+    elif h['is_document_section']:
+        level = "H1"
+    
+    # Only include H1, H2, H3 levels
+    if level not in {"H1", "H2", "H3"}:
+        return None
+
+    # Add trailing space to match common format requirements
+    return {
+        "level": level,
+        "text": text + " ",
+        "page": h['page']
+    }
+
+
+def iter_outline(pdf_path, sample_pages=STREAM_SAMPLE_PAGES, use_toc=True, deadline=None):
+    """
+    Stream the document outline page by page with bounded memory.
+
+    The body font is estimated from a stratified page sample (see
+    font_profile). Title and heading size tiers come from the first
+    sample_pages pages; later pages are parsed one at a time and discarded.
+    Levels can therefore differ from extract_document_structure when a
+    heading size only appears after the sample.
+
+    Args:
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        sample_pages (int): Pages profiled up front
+        use_toc (bool): Stream the embedded bookmark outline when it passes validation
+        deadline (float): time.monotonic() value after which streaming stops
+
+    Yields:
+        dict: {"title": ...} first, then one {"level", "text", "page"} entry per heading,
+        and a final {"partial": True, "pages_processed": n} if the deadline cut it short
+    """
+    doc = open_pdf(pdf_path)
+    try:
+        if use_toc:
+            toc = read_validated_toc(doc)
+            if toc:
+                title, outline = _outline_from_toc(doc, toc)
+                yield {"title": title}
+                yield from outline
+                return
+
+        body_text_style = profile_body_style(doc)
+        if body_text_style is None:
+            yield {"title": "Title Not Found"}
+            return
+
+        body_text_size = body_text_style[0]
+        sample = build_document_model(doc, 0, sample_pages)
+        sample_headings = classify_headings(*extract_line_features(sample), body_text_size)
+
+        # Cover page detection only needs the first page, which is always in the sample
+        page_offset = 0
+        if not any(h['page'] == 1 for h in sample_headings) and doc.page_count > 1:
+            if len(sample.page_texts[0].strip()) < 200:
+                page_offset = 1
+
+        title_candidates = [dict(h, page=max(1, h['page'] - page_offset)) for h in sample_headings]
+        yield {"title": _identify_title(doc, title_candidates)}
+
+        unique_sizes = sorted(set(h['size'] for h in sample_headings), reverse=True)
+        sample_by_page = defaultdict(list)
+        for h in sample_headings:
+            sample_by_page[h['page']].append(h)
+
+        for page_num in range(doc.page_count):
+            if page_num < sample.page_count:
+                page_headings = sample_by_page.pop(page_num + 1, [])
+            elif deadline is not None and time.monotonic() >= deadline:
+                yield {"partial": True, "pages_processed": page_num}
+                return
+            else:
+                page_model = build_document_model(doc, page_num, page_num + 1)
+                page_headings = classify_headings(*extract_line_features(page_model), body_text_size)
+
+            for h in sorted(page_headings, key=lambda x: -x['size']):
+                h['page'] = max(1, page_num + 1 - page_offset)
+                entry = _outline_entry(h, unique_sizes)
+                if entry:
+                    yield entry
+    finally:
+        doc.close()
 
 
 # Test function
@@ -3,94 +3,94 @@ Improved PDF Document Structure Extractor for Round 1A
 Enhanced to better match expected output format
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
 
 
 def extract_document_structure(pdf_path):
     """
     Enhanced document structure extraction with improved title and heading detection.
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
+    return outline_from_model(build_document_model(doc), doc), doc
+
+
+def outline_from_model(model, doc):
+    """
+    Improved heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata
+
+    Returns:
+        dict: outline_data with title and outline
+    """
     output = {"title": "Title Not Found", "outline": []}
     headings = []
-    font_counts = Counter()
-    page_texts = []
     
     # 1. Analyze document fonts and text patterns
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span['text'].strip()
-                        if text and len(text) > 3:  # Only count substantial text
-                            font_counts[(span['size'], span['font'])] += len(text)
+    font_counts = model.font_histogram(min_length=4)
 
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style (most common)
     body_text_style = font_counts.most_common(1)[0][0]
     body_text_size = body_text_style[0]
     
     # 2. Extract potential headings with enhanced filtering
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        mediabox = page.rect
+    for page_num in range(model.page_count):
+        mediabox = model.page_rect(page_num)
         
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:
-                # Focus on single-line blocks for headings
-                if len(block.get("lines", [])) == 1:
-                    line = block["lines"][0]
-                    line_text = "".join(s['text'] for s in line['spans']).strip()
-                    
-                    if not line_text or len(line_text) < 3:
-                        continue
-                    
-                    span = line['spans'][0]
-                    font_size = span['size']
-                    font_name = span['font']
-                    
-                    # Enhanced heading detection criteria
-                    is_larger = font_size > body_text_size + 1.0  # More strict size difference
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (span['flags'] & 16)
-                    is_reasonable_length = 5 <= len(line_text) <= 100  # Reasonable heading length
-                    is_not_sentence = not line_text.endswith('.')
-                    is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
-                    is_numbered = bool(re.match(r'^(\d+\.?\s|\d+\.\d+\.?\s|[IVXLC]+\.?\s|[A-Z]\.?\s)', line_text))
-                    is_title_case = line_text.istitle() or line_text.isupper()
-                    
-                    # Check for common heading patterns
-                    heading_patterns = [
-                        r'^(Chapter|Section|Part|Appendix)\s+\d+',
-                        r'^\d+\.\s+\w+',
-                        r'^\d+\.\d+\s+\w+',
-                        r'^(Introduction|Overview|Conclusion|Summary|References)',
-                        r'^(Table of Contents|Acknowledgements|Bibliography)',
-                        r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*\s*$'
-                    ]
-                    
-                    matches_pattern = any(re.match(pattern, line_text, re.IGNORECASE) for pattern in heading_patterns)
+        for block in model.page_blocks(page_num):
+            # Focus on single-line blocks for headings
+            block_lines = model.block_lines(block)
+            if len(block_lines) == 1:
+                line = block_lines[0]
+                line_text = model.line_text(line).strip()
+                
+                if not line_text or len(line_text) < 3:
+                    continue
+                
+                span = model.lines['first_span'][line]
+                font_size = float(model.spans['size'][span])
+                font_name = model.font_name(span)
+                
+                # Enhanced heading detection criteria
+                is_larger = font_size > body_text_size + 1.0  # More strict size difference
+                is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (model.spans['flags'][span] & 16)
+                is_reasonable_length = 5 <= len(line_text) <= 100  # Reasonable heading length
+                is_not_sentence = not line_text.endswith('.')
+                is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
+                is_numbered = bool(re.match(r'^(\d+\.?\s|\d+\.\d+\.?\s|[IVXLC]+\.?\s|[A-Z]\.?\s)', line_text))
+                is_title_case = line_text.istitle() or line_text.isupper()
+                
+                # Check for common heading patterns
+                heading_patterns = [
+                    r'^(Chapter|Section|Part|Appendix)\s+\d+',
+                    r'^\d+\.\s+\w+',
+                    r'^\d+\.\d+\s+\w+',
+                    r'^(Introduction|Overview|Conclusion|Summary|References)',
+                    r'^(Table of Contents|Acknowledgements|Bibliography)',
+                    r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*\s*$'
+                ]
+                
+                matches_pattern = any(re.match(pattern, line_text, re.IGNORECASE) for pattern in heading_patterns)
+                
+                # More selective heading criteria
+                if ((is_larger or is_bold or is_numbered or matches_pattern) and 
+                    is_reasonable_length and is_not_sentence and is_not_date and
+                    (is_title_case or is_numbered or matches_pattern)):
                     
-                    # More selective heading criteria
-                    if ((is_larger or is_bold or is_numbered or matches_pattern) and 
-                        is_reasonable_length and is_not_sentence and is_not_date and
-                        (is_title_case or is_numbered or matches_pattern)):
-                        
-                        headings.append({
-                            'text': line_text,
-                            'size': font_size,
-                            'page': page_num + 1,
-                            'is_numbered': is_numbered,
-                            'is_bold': is_bold
-                        })
+                    headings.append({
+                        'text': line_text,
+                        'size': font_size,
+                        'page': page_num + 1,
+                        'is_numbered': is_numbered,
+                        'is_bold': is_bold
+                    })
 
     # 3. Enhanced title extraction
     title = None
@@ -173,7 +173,7 @@ def extract_document_structure(pdf_path):
                     "page": h['page']
                 })
 
-    return output, doc
+    return output
 
 
 # Backward compatibility - use improved version by default
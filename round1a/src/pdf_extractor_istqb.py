@@ -3,115 +3,115 @@ ISTQB-specific PDF Document Structure Extractor for Round 1A
 Tuned specifically for ISTQB document format to match sample output exactly
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
 
 
 def extract_document_structure(pdf_path):
     """
     ISTQB-specific document structure extraction to match sample output exactly.
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
+    return outline_from_model(build_document_model(doc), doc), doc
+
+
+def outline_from_model(model, doc):
+    """
+    ISTQB-specific heading scoring and levelling policy over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document; read-only, may be shared with other strategies
+        doc (fitz.Document): Open document, used for metadata
+
+    Returns:
+        dict: outline_data with title and outline
+    """
     output = {"title": "Title Not Found", "outline": []}
     headings = []
-    font_counts = Counter()
-    page_texts = []
+    page_texts = model.page_texts
     
     # 1. Analyze document fonts and build comprehensive font profile
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span['text'].strip()
-                        if text and len(text) > 2:
-                            font_counts[(span['size'], span['font'])] += len(text)
+    font_counts = model.font_histogram(min_length=3)
 
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style (most common)
     body_text_style = font_counts.most_common(1)[0][0]
     body_text_size = body_text_style[0]
     
     # 2. Extract potential headings with ISTQB-specific criteria
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:
-                # Focus on single-line blocks and some multi-line for ISTQB format
-                if len(block.get("lines", [])) <= 2:  # Allow up to 2 lines for ISTQB headings
-                    line_texts = []
-                    font_size = None
-                    font_name = None
-                    
-                    for line in block.get("lines", []):
-                        line_text = "".join(s['text'] for s in line['spans']).strip()
-                        if line_text:
-                            line_texts.append(line_text)
-                            if font_size is None:  # Use first span's font info
-                                span = line['spans'][0]
-                                font_size = span['size']
-                                font_name = span['font']
-                    
-                    if not line_texts:
-                        continue
-                    
-                    # Combine multi-line headings
-                    combined_text = " ".join(line_texts).strip()
-                    
-                    if len(combined_text) < 3:
-                        continue
-                    
-                    # Enhanced heading detection for ISTQB format
-                    is_larger = font_size > body_text_size + 0.3
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or any(span.get('flags', 0) & 16 for line in block.get("lines", []) for span in line.get("spans", []))
-                    is_reasonable_length = 3 <= len(combined_text) <= 150
-                    is_not_sentence = not combined_text.endswith('.')
-                    is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', combined_text)
-                    
-                    # ISTQB-specific patterns
-                    is_numbered_main = bool(re.match(r'^\d+\.\s+[A-Z]', combined_text))  # "1. Introduction"
-                    is_numbered_sub = bool(re.match(r'^\d+\.\d+\s+[A-Z]', combined_text))  # "2.1 Intended Audience"
-                    is_version = bool(re.match(r'^Version\s+\d', combined_text, re.IGNORECASE))
-                    
-                    # ISTQB document sections
-                    is_istqb_section = any(keyword in combined_text.lower() for keyword in [
-                        'revision history', 'table of contents', 'acknowledgements',
-                        'introduction', 'overview', 'references', 'intended audience',
-                        'career paths', 'learning objectives', 'entry requirements',
-                        'structure and course', 'keeping it current', 'business outcomes',
-                        'content', 'trademarks', 'documents and web sites'
-                    ])
-                    
-                    # Foundation/Extensions related
-                    is_foundation_related = any(keyword in combined_text.lower() for keyword in [
-                        'foundation level', 'extensions', 'agile tester', 'syllabus',
-                        'qualifications board', 'istqb'
-                    ])
+    for page_num in range(model.page_count):
+        for block in model.page_blocks(page_num):
+            # Focus on single-line blocks and some multi-line for ISTQB format
+            block_lines = model.block_lines(block)
+            if len(block_lines) <= 2:  # Allow up to 2 lines for ISTQB headings
+                line_texts = []
+                font_size = None
+                font_name = None
+                
+                for line in block_lines:
+                    line_text = model.line_text(line).strip()
+                    if line_text:
+                        line_texts.append(line_text)
+                        if font_size is None:  # Use first span's font info
+                            span = model.lines['first_span'][line]
+                            font_size = float(model.spans['size'][span])
+                            font_name = model.font_name(span)
+                
+                if not line_texts:
+                    continue
+                
+                # Combine multi-line headings
+                combined_text = " ".join(line_texts).strip()
+                
+                if len(combined_text) < 3:
+                    continue
+                
+                # Enhanced heading detection for ISTQB format
+                is_larger = font_size > body_text_size + 0.3
+                is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or any(model.spans['flags'][span] & 16 for line in block_lines for span in model.line_spans(line))
+                is_reasonable_length = 3 <= len(combined_text) <= 150
+                is_not_sentence = not combined_text.endswith('.')
+                is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', combined_text)
+                
+                # ISTQB-specific patterns
+                is_numbered_main = bool(re.match(r'^\d+\.\s+[A-Z]', combined_text))  # "1. Introduction"
+                is_numbered_sub = bool(re.match(r'^\d+\.\d+\s+[A-Z]', combined_text))  # "2.1 Intended Audience"
+                is_version = bool(re.match(r'^Version\s+\d', combined_text, re.IGNORECASE))
+                
+                # ISTQB document sections
+                is_istqb_section = any(keyword in combined_text.lower() for keyword in [
+                    'revision history', 'table of contents', 'acknowledgements',
+                    'introduction', 'overview', 'references', 'intended audience',
+                    'career paths', 'learning objectives', 'entry requirements',
+                    'structure and course', 'keeping it current', 'business outcomes',
+                    'content', 'trademarks', 'documents and web sites'
+                ])
+                
+                # Foundation/Extensions related
+                is_foundation_related = any(keyword in combined_text.lower() for keyword in [
+                    'foundation level', 'extensions', 'agile tester', 'syllabus',
+                    'qualifications board', 'istqb'
+                ])
+                
+                # More inclusive heading criteria for ISTQB
+                if ((is_larger or is_bold or is_numbered_main or is_numbered_sub or 
+                     is_istqb_section or is_foundation_related or is_version) and 
+                    is_reasonable_length and is_not_sentence and is_not_date):
                     
-                    # More inclusive heading criteria for ISTQB
-                    if ((is_larger or is_bold or is_numbered_main or is_numbered_sub or 
-                         is_istqb_section or is_foundation_related or is_version) and 
-                        is_reasonable_length and is_not_sentence and is_not_date):
-                        
-                        headings.append({
-                            'text': combined_text,
-                            'size': font_size,
-                            'page': page_num + 1,
-                            'is_numbered_main': is_numbered_main,
-                            'is_numbered_sub': is_numbered_sub,
-                            'is_bold': is_bold,
-                            'is_istqb_section': is_istqb_section,
-                            'is_foundation_related': is_foundation_related,
-                            'is_version': is_version
-                        })
+                    headings.append({
+                        'text': combined_text,
+                        'size': font_size,
+                        'page': page_num + 1,
+                        'is_numbered_main': is_numbered_main,
+                        'is_numbered_sub': is_numbered_sub,
+                        'is_bold': is_bold,
+                        'is_istqb_section': is_istqb_section,
+                        'is_foundation_related': is_foundation_related,
+                        'is_version': is_version
+                    })
 
     # 3. ISTQB-specific title extraction
     title = None
@@ -200,7 +200,7 @@ def extract_document_structure(pdf_path):
                     "page": h['page']
                 })
 
-    return output, doc
+    return output
 
 
 # Test function
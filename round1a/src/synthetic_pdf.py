@@ -0,0 +1,156 @@
+"""
+Synthetic PDF Corpus for Round 1A
+Generates documents with a known outline for benchmarks and accuracy checks.
+"""
+
+import os
+import random
+
+import fitz  # PyMuPDF
+import numpy as np
+
+
+# Bump whenever generated documents change, so cached corpora are rebuilt
+GENERATOR_VERSION = "2"
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 56
+COLUMN_GAP = 24
+BODY_SIZE = 10
+LINE_SPACING = 1.4
+
+# Heading hierarchies: level -> (font size, PyMuPDF base-14 font); "title" is page 1 only
+HIERARCHIES = {
+    # Clearly separated sizes, regular body font
+    "classic": {"title": (26, "hebo"), "H1": (20, "hebo"), "H2": (15, "hebo"), "H3": (12, "hebo")},
+    # Heading sizes within a few points of the body text
+    "tight": {"title": (16, "hebo"), "H1": (14, "hebo"), "H2": (13, "hebo"), "H3": (12, "helv")},
+    # Same size as the body; only weight and numbering mark headings
+    "flat": {"title": (18, "hebo"), "H1": (BODY_SIZE, "hebo"), "H2": (BODY_SIZE, "hebo"), "H3": (BODY_SIZE, "hebo")},
+}
+
+_WORDS = (
+    "analysis system document process design model data result method value structure "
+    "section report review policy network signal market energy quality control sample "
+    "measure layer service budget travel region project method context pattern feature"
+).split()
+
+
+def corpus_name(pages, hierarchy="classic", columns=1, images=False, toc=False, seed=0):
+    """File name encoding the generator parameters."""
+    parts = [f"synthetic_v{GENERATOR_VERSION}", f"{pages}p", hierarchy, f"{columns}col"]
+    if images:
+        parts.append("img")
+    if toc:
+        parts.append("toc")
+    parts.append(f"s{seed}")
+    return "_".join(parts) + ".pdf"
+
+
+def generate_document(path, pages, hierarchy="classic", columns=1, images=False, toc=False, seed=0):
+    """
+    Write a synthetic PDF and return its golden outline.
+
+    Every page opens a numbered H1 or H2 section and has one more heading one
+    level down (H2 under an H1, H3 under an H2) between body paragraphs in one
+    or more columns, so the outline nests properly and can be embedded as a
+    TOC. Image-heavy pages carry a half-page raster image that takes space
+    from the text.
+
+    Args:
+        path (str): Output PDF path
+        pages (int): Page count
+        hierarchy (str): Key of HIERARCHIES
+        columns (int): Text columns per page
+        images (bool): Add a raster image to every page
+        toc (bool): Embed a bookmark outline matching the headings
+        seed (int): Seed for the generated text
+
+    Returns:
+        dict: {"title", "outline": [{level, text, page}]}, the extractor output schema
+    """
+    styles = HIERARCHIES[hierarchy]
+    rng = random.Random(seed)
+    title = "Synthetic %s Report %d" % (hierarchy.title(), seed)
+    outline = []
+    section = subsection = 0
+
+    doc = fitz.open()
+    image = _noise_pixmap(seed) if images else None
+    for page_num in range(1, pages + 1):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        y = MARGIN
+
+        if page_num == 1:
+            y = _insert_line(page, MARGIN, y, title, *styles["title"])
+
+        # A new H1 every fourth page, otherwise an H2 within the current H1
+        if section == 0 or page_num % 4 == 1:
+            section += 1
+            subsection = 0
+            entry = ("H1", "%d. %s" % (section, _phrase(rng, 3).title()))
+        else:
+            subsection += 1
+            entry = ("H2", "%d.%d %s" % (section, subsection, _phrase(rng, 4).title()))
+        y = _insert_line(page, MARGIN, y + 6, entry[1], *styles[entry[0]])
+        outline.append({"level": entry[0], "text": entry[1], "page": page_num})
+
+        if image is not None:
+            image_rect = fitz.Rect(MARGIN, y + 6, PAGE_WIDTH - MARGIN, y + 6 + (PAGE_HEIGHT - 2 * MARGIN) / 2)
+            page.insert_image(image_rect, pixmap=image)
+            y = image_rect.y1
+
+        # Body paragraphs with a heading one level down in the middle of the page
+        column_width = (PAGE_WIDTH - 2 * MARGIN - (columns - 1) * COLUMN_GAP) / columns
+        sub_level = "H%d" % (int(entry[0][1]) + 1)
+        if sub_level == "H2":
+            subsection += 1
+            sub_text = "%d.%d %s" % (section, subsection, _phrase(rng, 4).title())
+        else:
+            sub_text = _phrase(rng, 3).title()
+        for column in range(columns):
+            x = MARGIN + column * (column_width + COLUMN_GAP)
+            column_y = _insert_paragraph(page, x, y + 8, column_width, rng, lines=6)
+            if column == 0:
+                column_y = _insert_line(page, x, column_y + 6, sub_text, *styles[sub_level])
+            _insert_paragraph(page, x, column_y + 4, column_width, rng, bottom=PAGE_HEIGHT - MARGIN)
+        outline.append({"level": sub_level, "text": sub_text, "page": page_num})
+
+    if toc:
+        doc.set_toc([[int(h["level"][1]), h["text"], h["page"]] for h in outline])
+    doc.set_metadata({"title": title})
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return {"title": title, "outline": outline}
+
+
+def _phrase(rng, words):
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _insert_line(page, x, y, text, size, font):
+    """Insert one line with its top at y; return the y below it."""
+    page.insert_text((x, y + size), text, fontsize=size, fontname=font)
+    return y + size * LINE_SPACING
+
+
+def _insert_paragraph(page, x, y, width, rng, lines=None, bottom=None):
+    """Insert body lines of roughly `width` points until `lines` or `bottom` is reached."""
+    line_height = BODY_SIZE * LINE_SPACING
+    if bottom is not None:
+        lines = max(0, int((bottom - y) // line_height))
+    words_per_line = max(2, int(width / (BODY_SIZE * 5.2)))
+    text = ["%s %s" % (_phrase(rng, words_per_line - 1).capitalize(), rng.choice(_WORDS)) for _ in range(lines)]
+    if text:
+        page.insert_text((x, y + BODY_SIZE), text, fontsize=BODY_SIZE, fontname="helv", lineheight=LINE_SPACING)
+    return y + lines * line_height
+
+
+def _noise_pixmap(seed, width=320, height=200):
+    """Random RGB image; noise does not compress, so it weighs like a photo."""
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), 0)
+    samples = np.frombuffer(pixmap.samples_mv, dtype=np.uint8)
+    samples[:] = np.random.default_rng(seed).integers(0, 256, size=len(samples), dtype=np.uint8)
+    return pixmap
@@ -0,0 +1,79 @@
+"""
+Embedded-TOC Fast Path for Round 1A
+Reads the PDF bookmark outline and checks it against page text before trusting it.
+"""
+
+import re
+
+
+# Number of TOC entries spot-checked against the text of their target page
+TOC_VALIDATION_SAMPLES = 5
+
+# Leading characters of a title that must appear on its page (titles often wrap)
+TOC_MATCH_PREFIX = 40
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def _sample_indices(count, samples):
+    """Evenly spaced indices into a list of the given length."""
+    if count <= samples:
+        return list(range(count))
+    return sorted(set(round(i * (count - 1) / (samples - 1)) for i in range(samples)))
+
+
+def validate_toc(doc, toc, samples=TOC_VALIDATION_SAMPLES):
+    """
+    Cheaply check that a bookmark outline describes this document.
+
+    Every entry must point at a real page, and a majority of a small, evenly
+    spaced sample of titles must appear in the text of their target page.
+
+    Args:
+        doc (fitz.Document): Open PyMuPDF document
+        toc (list): Entries from doc.get_toc(simple=True)
+        samples (int): Maximum number of entries to check against page text
+
+    Returns:
+        bool: True when the TOC can replace the heuristic pipeline
+    """
+    if not toc:
+        return False
+    if any(not title.strip() or not 1 <= page <= doc.page_count for level, title, page in toc):
+        return False
+
+    page_texts = {}
+    matched = 0
+    checked = _sample_indices(len(toc), samples)
+    for index in checked:
+        level, title, page = toc[index]
+        if page not in page_texts:
+            page_texts[page] = _normalize(doc[page - 1].get_text())
+        if _normalize(title)[:TOC_MATCH_PREFIX] in page_texts[page]:
+            matched += 1
+
+    return matched * 2 > len(checked)
+
+
+def read_validated_toc(doc):
+    """
+    Read the embedded TOC if it passes validation.
+
+    Args:
+        doc (fitz.Document): Open PyMuPDF document
+
+    Returns:
+        list: (level, title, page) tuples with stripped titles, or None
+    """
+    try:
+        toc = doc.get_toc(simple=True)
+    except Exception:
+        return None
+
+    if not validate_toc(doc, toc):
+        return None
+    return [(level, title.strip(), page) for level, title, page in toc]
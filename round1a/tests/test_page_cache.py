@@ -0,0 +1,42 @@
+"""
+Page cache eviction when every write comes from a fresh PageCache, as with
+the portal scripts' one process per upload.
+"""
+
+import os
+import random
+import sys
+
+import fitz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from page_cache import EVICTION_SCAN_FRACTION, PageCache
+from page_model import parse_page
+
+
+def _cache_bytes(cache_dir):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(cache_dir) for name in files if name.endswith(".npz"))
+
+
+def test_fresh_cache_per_write_stays_within_budget(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Cached page text " * 20, fontsize=10)
+    record = parse_page(page)
+
+    PageCache(str(tmp_path / "probe")).store("0" * 64, 0, record)
+    record_bytes = _cache_bytes(tmp_path / "probe")
+
+    # A scan slice holds two records, so no single write reaches it on its own
+    max_bytes = 2 * EVICTION_SCAN_FRACTION * record_bytes
+    cache_dir = str(tmp_path / "cache")
+    random.seed(0)
+    for index in range(4 * max_bytes // record_bytes):
+        cache = PageCache(cache_dir, max_bytes=max_bytes)
+        cache.store("%064x" % index, 0, record)
+        cache.evict()
+        # Between scans the cache overshoots by a few scan slices at most
+        assert _cache_bytes(cache_dir) <= max_bytes + 8 * max_bytes // EVICTION_SCAN_FRACTION
+
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Parity check for the Round 1B ONNX Runtime backend
+Scores the same chunks with the torch and int8 ONNX backends and compares the results.
+
+Needs both backends installed and the models exported with export_onnx.py.
+Exits non-zero when agreement falls below the thresholds.
+
+Usage (from the round1b directory):
+    python onnx_parity.py                          # sample PDFs from the repository root
+    python onnx_parity.py --pdfs a.pdf b.pdf
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import numpy as np
+
+from document_pipeline import process_document
+from semantic_ranker import SemanticRanker
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_PDFS = ("sample.pdf", "sample1.pdf")
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'persona_config.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ONNX Runtime and torch ranker scores")
+    parser.add_argument("--pdfs", nargs='+', default=[os.path.join(ROOT_DIR, name) for name in SAMPLE_PDFS],
+                        help="Documents whose chunks are scored")
+    parser.add_argument("--models-dir", default=os.path.join(ROOT_DIR, 'models'), help="Model directory")
+    parser.add_argument("--min-embedding-cosine", type=float, default=0.98,
+                        help="Lowest allowed cosine between the backends' embeddings of a text")
+    parser.add_argument("--min-rank-correlation", type=float, default=0.95,
+                        help="Lowest allowed Spearman correlation of cross-encoder scores")
+    parser.add_argument("--min-top-overlap", type=float, default=0.8,
+                        help="Lowest allowed overlap of each document's top 5 sections")
+    return parser.parse_args()
+
+
+def spearman(a, b):
+    """Spearman rank correlation (no tie correction)."""
+    if len(a) < 2:
+        return 1.0
+    rank_a = np.argsort(np.argsort(a)).astype(np.float64)
+    rank_b = np.argsort(np.argsort(b)).astype(np.float64)
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def main():
+    args = parse_args()
+
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    persona, job_to_be_done = config['persona'], config['job_to_be_done']
+    query = f"{persona}. Task: {job_to_be_done}"
+
+    documents = [process_document(pdf_path)[1] for pdf_path in args.pdfs]
+    texts = [chunk['content'] for chunks in documents for chunk in chunks]
+    if not texts:
+        print("Error: no chunks extracted from the given PDFs")
+        sys.exit(1)
+    print(f"{len(texts)} chunks from {len(documents)} documents")
+
+    rankers = {backend: SemanticRanker(model_dir=args.models_dir, backend=backend) for backend in ('torch', 'onnx')}
+    embeddings, rerank_scores, rankings, seconds = {}, {}, {}, {}
+    for backend, ranker in rankers.items():
+        started = time.perf_counter()
+        embeddings[backend] = np.asarray(ranker.embedding_model.encode(texts, batch_size=32), dtype=np.float32)
+        rerank_scores[backend] = np.asarray(ranker.reranker.predict([[query, text] for text in texts], batch_size=16),
+                                            dtype=np.float32)
+        rankings[backend] = ranker.rank_corpus(documents, persona, job_to_be_done, per_document=5)
+        seconds[backend] = time.perf_counter() - started
+
+    # Per-text cosine between the two backends' embeddings
+    torch_vectors, onnx_vectors = embeddings['torch'], embeddings['onnx']
+    cosines = (torch_vectors * onnx_vectors).sum(axis=1) / np.maximum(
+        np.linalg.norm(torch_vectors, axis=1) * np.linalg.norm(onnx_vectors, axis=1), 1e-12)
+    correlation = spearman(rerank_scores['torch'], rerank_scores['onnx'])
+    score_error = float(np.abs(rerank_scores['torch'] - rerank_scores['onnx']).max())
+
+    overlaps = []
+    for torch_ranked, onnx_ranked in zip(rankings['torch'], rankings['onnx']):
+        torch_top = {(chunk['section_title'], chunk['page_number']) for chunk in torch_ranked}
+        onnx_top = {(chunk['section_title'], chunk['page_number']) for chunk in onnx_ranked}
+        if torch_top:
+            overlaps.append(len(torch_top & onnx_top) / len(torch_top))
+    lowest_overlap = min(overlaps, default=1.0)
+    mean_overlap = float(np.mean(overlaps)) if overlaps else 1.0
+
+    print(f"embedding cosine       min {cosines.min():.4f}  mean {cosines.mean():.4f}")
+    print(f"cross-encoder scores   spearman {correlation:.4f}  max abs diff {score_error:.4f}")
+    print(f"top-5 section overlap  min {lowest_overlap:.2f}  mean {mean_overlap:.2f}")
+    print(f"seconds                torch {seconds['torch']:.2f}  onnx {seconds['onnx']:.2f}")
+
+    failures = []
+    if cosines.min() < args.min_embedding_cosine:
+        failures.append("embedding cosine")
+    if correlation < args.min_rank_correlation:
+        failures.append("cross-encoder rank correlation")
+    if lowest_overlap < args.min_top_overlap:
+        failures.append("top-5 overlap")
+    if failures:
+        print("FAIL: " + ", ".join(failures))
+        sys.exit(1)
+    print("OK: ONNX backend agrees with torch")
+
+
+if __name__ == "__main__":
+    main()
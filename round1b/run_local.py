@@ -22,8 +22,8 @@ if not os.path.exists(os.path.join(models_dir, 'all-MiniLM-L6-v2')):
 
 # Import Round 1B modules
 try:
-    from pdf_extractor import extract_document_structure
-    from chunking import create_semantic_chunks
+    from document_pipeline import process_document
+    from near_duplicates import NearDuplicateIndex
     from semantic_ranker import SemanticRanker
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -109,32 +109,30 @@ def main():
         print("🔄 Loading models...")
         ranker = SemanticRanker(model_dir=models_dir)
         
+        # Repeated sections and boilerplate are scored once across all documents
+        duplicates = NearDuplicateIndex()
+        
         # Process each PDF and collect chunks
         all_chunks = []
         
+        extracted = []
         for pdf_path in available_pdfs:
             pdf_name = os.path.basename(pdf_path)
             print(f"📄 Processing: {pdf_name}")
             
-            # Extract structure
-            outline_data, doc = extract_document_structure(pdf_path)
-            
-            # Create chunks
-            outline_json = json.dumps(outline_data, indent=2)
-            chunks = create_semantic_chunks(pdf_path, outline_json)
-            
-            # Rank chunks for this document
-            ranked = ranker.rank_chunks(chunks, selected_persona['persona'], selected_persona['job_to_be_done'])
-            
-            # Take best chunk from this document
+            # Extract structure and create chunks from a single parse
+            outline_data, chunks = process_document(pdf_path)
+            extracted.append((pdf_name, chunks))
+        
+        # Rank all documents' chunks in one pass, keeping the best chunk of each
+        ranked_documents = ranker.rank_corpus([chunks for _, chunks in extracted], selected_persona['persona'],
+                                              selected_persona['job_to_be_done'], per_document=1,
+                                              duplicates=duplicates)
+        for (pdf_name, _), ranked in zip(extracted, ranked_documents):
             if ranked:
                 best_chunk = ranked[0]
                 best_chunk["document"] = pdf_name
                 all_chunks.append(best_chunk)
-            
-            # Close document
-            if doc:
-                doc.close()
         
         # Sort all chunks by score and take top 5
         top_chunks = sorted(all_chunks, key=lambda x: x.get("score", 0), reverse=True)[:5]
@@ -3,90 +3,159 @@ Semantic Chunking Module for Round 1B
 Creates meaningful text chunks from PDF documents based on document structure.
 """
 
-import os
 import json
-import fitz  # PyMuPDF
 
+import numpy as np
 
-def create_semantic_chunks(pdf_path, outline_json):
+from page_model import build_document_model
+from pdf_source import open_pdf, source_name
+from stage_metrics import measure
+
+
+def create_semantic_chunks(pdf_path, outline_json, doc_name=None, metrics=None):
     """
     Create semantic chunks from a PDF document based on its outline structure.
-    
+
+    Opens and parses the PDF again; when the outline was just extracted in
+    this process, document_pipeline.process_document avoids the second parse.
+
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
         outline_json (str): JSON string containing the document outline
-        
+        doc_name (str): Document name for the chunks; defaults to the file name
+        metrics (StageMetrics): Collects "chunk_parse" and "chunking" stage timings when given
+
     Returns:
-        list: List of chunk dictionaries with content and metadata
+        list: List of chunk dictionaries with content and metadata, in outline order
     """
     # Load outline from JSON string
     outline_data = json.loads(outline_json)
-    outline = outline_data.get('outline', [])
-
-    # Extract doc name from file name
-    doc_name = os.path.basename(pdf_path)
-
-    # Get full text from PDF using simple extraction
-    document = fitz.open(pdf_path)
-    full_text_by_page = {}
-    
-    for page_num in range(len(document)):
-        page = document.load_page(page_num)
-        page_text = page.get_text()
-        full_text_by_page[page_num + 1] = page_text
-    
-    document.close()
-
-    # Create chunks based on outline structure
-    chunks = []
-    
-    for i, heading in enumerate(outline):
-        section_title = heading['text']
-        page_num = heading['page']
-        
-        # Get text content for this section
-        # For simplicity, use text from the page where the heading appears
-        page_text = full_text_by_page.get(page_num, '')
-        
-        # Try to extract content after the heading
-        lines = page_text.split('\n')
-        content_lines = []
-        found_heading = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for the heading in the text
-            if section_title.lower() in line.lower() and not found_heading:
-                found_heading = True
-                continue
-            
-            # Collect content after heading until next major section
-            if found_heading:
-                # Stop at next major heading or if line looks like a heading
-                if (line.isupper() and len(line.split()) <= 8) or \
-                   line.startswith(('Appendix', 'Phase', 'Summary', 'Background')):
-                    break
-                content_lines.append(line)
-        
-        # If no specific content found, use some page text
-        if not content_lines and page_text:
-            content_lines = page_text.split('\n')[:10]  # First 10 lines
-        
-        chunk_text = ' '.join(content_lines).strip()
-        
-        # Ensure we have some content
-        if not chunk_text:
-            chunk_text = f"Content for {section_title}"
-        
-        chunk = {
-            'doc_name': doc_name,
-            'section_title': section_title,
-            'page_number': page_num,  # Use 'page_number' instead of 'page_num'
-            'content': chunk_text
-        }
-        chunks.append(chunk)
-
-    return chunks
\ No newline at end of file
+
+    # Parse the pages the outline was built from (served from the page cache when enabled);
+    # a partial outline only covers its first pages_processed pages
+    with measure(metrics, "chunk_parse") as counts:
+        document = open_pdf(pdf_path)
+        try:
+            model = build_document_model(document, 0, outline_data.get('pages_processed'))
+        finally:
+            document.close()
+        counts['pages'] = model.page_count
+
+    # Extract doc name from file name unless given (in-memory sources have none)
+    return chunks_from_model(model, outline_data.get('outline', []), doc_name or source_name(pdf_path), metrics)
+
+
+def chunks_from_model(model, outline, doc_name, metrics=None):
+    """
+    Cut a parsed document into one chunk per outline heading.
+
+    Each heading's section runs from the line after the heading to the next
+    heading in reading order, across page breaks. The document is cut in one
+    ordered pass over its lines.
+
+    Args:
+        model (DocumentModel): Parsed document the outline was extracted from
+        outline (list): Outline entries. Headings with an "offset" (character
+            offset of the heading line in the model text, as emitted by
+            pdf_extractor) are anchored exactly; others are located by title
+            on their page.
+        doc_name (str): Document name for the chunks
+        metrics (StageMetrics): Collects timings and counts for the "chunking" stage when given
+
+    Returns:
+        list: List of chunk dictionaries with content and metadata, in outline order
+    """
+    with measure(metrics, "chunking") as counts:
+        line_texts, line_starts = _line_texts(model)
+        anchors = [_anchor_line(model, heading, line_texts, line_starts) for heading in outline]
+        sections = _slice_sections(anchors, line_texts)
+
+        # Create chunks based on outline structure
+        chunks = []
+        for heading, chunk_text in zip(outline, sections):
+            section_title = heading['text']
+
+            # Ensure we have some content
+            if not chunk_text:
+                chunk_text = f"Content for {section_title}"
+
+            chunk = {
+                'doc_name': doc_name,
+                'section_title': section_title,
+                'page_number': heading['page'],  # Use 'page_number' instead of 'page_num'
+                'content': chunk_text
+            }
+            chunks.append(chunk)
+        counts['pages'] = model.page_count
+        counts['lines'] = len(line_texts)
+        counts['chunks'] = len(chunks)
+
+    return chunks
+
+
+def _line_texts(model):
+    """
+    Stripped text and text offset of every line, in reading order.
+
+    Returns:
+        tuple: (list of line texts, int array of line start offsets into model.text)
+    """
+    first = model.lines['first_span']
+    last = first + np.maximum(model.lines['span_count'], 1) - 1
+    has_spans = model.lines['span_count'] > 0
+    # Lines without spans get an empty [start, start) range at the next span's start
+    span_starts = np.append(model.spans['start'], len(model.text))
+    span_ends = np.append(model.spans['end'], len(model.text))
+    starts = span_starts[first]
+    ends = np.where(has_spans, span_ends[np.minimum(last, len(span_ends) - 1)], starts)
+
+    text = model.text
+    return [text[start:end].strip() for start, end in zip(starts.tolist(), ends.tolist())], starts
+
+
+def _anchor_line(model, heading, line_texts, line_starts):
+    """
+    Index of the line a heading sits on.
+
+    Uses the heading's text offset when the extractor provided one; otherwise
+    the first line on the heading's page containing its title, else the page's
+    first line. Returns -1 when the heading lies outside the parsed pages.
+    """
+    offset = heading.get('offset')
+    if offset is not None:
+        if offset >= len(model.text):
+            return -1
+        return int(np.searchsorted(line_starts, offset, side='right')) - 1
+
+    page_index = heading['page'] - 1
+    if page_index >= model.page_count:
+        return -1
+    page_start, page_end = np.searchsorted(model.lines['page'], [page_index, page_index + 1])
+    title = heading['text'].strip().lower()
+    for line in range(page_start, page_end):
+        if title and title in line_texts[line].lower():
+            return line
+    return int(page_start) if page_start < page_end else -1
+
+
+def _slice_sections(anchors, line_texts):
+    """
+    Section text for each heading anchor in one ordered pass.
+
+    A section runs from the line after its anchor up to the next anchor on a
+    later line (or the end of the document). Headings sharing a line share
+    the same section; headings without an anchor get empty text.
+
+    Returns:
+        list: Section text per anchor, in the order given
+    """
+    sections = [""] * len(anchors)
+    order = sorted((line, index) for index, line in enumerate(anchors) if line >= 0)
+
+    end = len(line_texts)
+    for position in range(len(order) - 1, -1, -1):
+        line, index = order[position]
+        if position + 1 < len(order) and order[position + 1][0] > line:
+            end = order[position + 1][0]
+        sections[index] = " ".join(text for text in line_texts[line + 1:end] if text)
+    return sections
@@ -0,0 +1,36 @@
+"""
+In-Process Document Pipeline for Round 1B
+Extracts the outline and cuts the chunks of a PDF from a single open and parse.
+"""
+
+from chunking import chunks_from_model
+from pdf_extractor import outline_from_model, parse_document
+from pdf_source import source_name
+
+
+def process_document(pdf_path, doc_name=None, deadline=None, page_budget=None, metrics=None):
+    """
+    Outline and chunks of one document.
+
+    Equivalent to extract_document_structure followed by create_semantic_chunks
+    on the JSON-encoded outline, but the PDF is opened and parsed once and the
+    page model and outline are handed to the chunker directly.
+
+    Args:
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        doc_name (str): Document name for the chunks; defaults to the file name
+        deadline (float): time.monotonic() value after which no more pages are parsed
+        page_budget (int): Maximum number of pages to parse
+        metrics (StageMetrics): Collects per-stage timings and counts when given
+
+    Returns:
+        tuple: (outline_data dict, list of chunks)
+    """
+    doc, model = parse_document(pdf_path, deadline, page_budget, metrics)
+    try:
+        outline_data = outline_from_model(model, doc, metrics)
+    finally:
+        doc.close()
+
+    chunks = chunks_from_model(model, outline_data['outline'], doc_name or source_name(pdf_path), metrics)
+    return outline_data, chunks
@@ -0,0 +1,59 @@
+"""
+Dynamic Batching Module for Round 1B
+Groups model inputs of similar token length into batches under a padded-token budget.
+"""
+
+import numpy as np
+
+
+# Padded tokens per batch: the fixed batch sizes they replace at full sequence length
+# (32 x 256 for the embedding model, 16 x 512 for the cross-encoder)
+EMBEDDING_BATCH_TOKENS = 32 * 256
+RERANK_BATCH_TOKENS = 16 * 512
+
+
+def token_budget_batches(lengths, max_tokens):
+    """
+    Split items into batches whose padded size stays within a token budget.
+
+    Items are taken longest first, so each batch holds items of similar length
+    and pads little; a batch's padded size is its item count times its longest
+    item. An item longer than the budget gets a batch of its own.
+
+    Args:
+        lengths (list): Token length of every item
+        max_tokens (int): Padded tokens allowed per batch
+
+    Returns:
+        list: int arrays of item indices, one per batch; every item appears once
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    order = np.argsort(-lengths, kind='stable')
+    batches = []
+    start = 0
+    while start < len(order):
+        longest = max(int(lengths[order[start]]), 1)
+        size = max(1, max_tokens // longest)
+        batches.append(order[start:start + size])
+        start += size
+    return batches
+
+
+def run_in_batches(items, lengths, max_tokens, run):
+    """
+    Apply a batch function over token-budgeted batches, keeping input order.
+
+    Args:
+        items (list): Model inputs
+        lengths (list): Token length of every item
+        max_tokens (int): Padded tokens allowed per batch
+        run (callable): Maps a list of items to one output per item
+
+    Returns:
+        list: Output per item, in the order of items
+    """
+    outputs = [None] * len(items)
+    for batch in token_budget_batches(lengths, max_tokens):
+        for index, output in zip(batch.tolist(), run([items[index] for index in batch])):
+            outputs[index] = output
+    return outputs
@@ -0,0 +1,175 @@
+"""
+Persistent Embedding Store
+Keeps chunk embeddings across requests and processes, keyed by model and normalized text.
+"""
+
+import hashlib
+import os
+import random
+import sqlite3
+import time
+
+import numpy as np
+
+
+# Bump whenever the stored vector layout or text normalization changes
+EMBEDDING_STORE_VERSION = 1
+
+# 384-dimensional float16 vectors take 768 bytes; 200k entries stay near 200MB with keys
+DEFAULT_MAX_ENTRIES = 200000
+
+# Fraction of the budget written between eviction scans
+EVICTION_SCAN_FRACTION = 32
+
+# Seconds a process waits on another one's write lock
+BUSY_TIMEOUT = 30
+
+_TABLE = "embeddings_v%d" % EMBEDDING_STORE_VERSION
+
+# SQLite host parameter limit is 999 on older builds
+_LOOKUP_BATCH = 900
+
+_default_store = None
+
+
+def text_digest(text):
+    """
+    SHA-256 digest of a text with whitespace runs collapsed, so the same chunk
+    extracted with different line breaks maps to the same entry.
+
+    Returns:
+        bytes: 32-byte digest
+    """
+    return hashlib.sha256(" ".join(text.split()).encode('utf-8')).digest()
+
+
+class EmbeddingStore:
+    """
+    SQLite table of float16 vectors keyed by (model id, text digest).
+
+    The database runs in WAL mode, so concurrent worker processes read while
+    one writes; writers wait up to BUSY_TIMEOUT for the lock. Lookups refresh
+    an entry's last use, and eviction drops the least recently used entries.
+    Database errors are treated as misses: the store only ever saves work.
+    """
+
+    def __init__(self, path, max_entries=None):
+        """
+        Args:
+            path (str): SQLite database file shared by every worker
+            max_entries (int): Size budget; defaults to $EMBEDDING_STORE_MAX_ENTRIES or 200k
+        """
+        self.path = path
+        self.max_entries = max_entries or int(os.environ.get("EMBEDDING_STORE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        # Start at a random point of the scan interval: a request stores far fewer
+        # vectors than a slice, yet still scans with probability proportional to them
+        self._unscanned_entries = random.randrange(max(1, self.max_entries // EVICTION_SCAN_FRACTION))
+        self._connection = None
+        self._pid = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _connect(self):
+        # Connections must not cross a fork; reopen in each process
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS %s (model TEXT NOT NULL, digest BLOB NOT NULL, vector BLOB NOT NULL, "
+                    "last_used REAL NOT NULL, PRIMARY KEY (model, digest))" % _TABLE)
+                connection.execute("CREATE INDEX IF NOT EXISTS %s_last_used ON %s (last_used)"
+                                   % (_TABLE, _TABLE))
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def load(self, model_id, digests):
+        """
+        Look up vectors.
+
+        Args:
+            model_id (str): Model the vectors were computed with
+            digests (list): text_digest() values
+
+        Returns:
+            dict: digest -> float32 vector, for the digests found
+        """
+        found = {}
+        unique = list(dict.fromkeys(digests))
+        try:
+            connection = self._connect()
+            for start in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[start:start + _LOOKUP_BATCH]
+                rows = connection.execute(
+                    "SELECT digest, vector FROM %s WHERE model = ? AND digest IN (%s)"
+                    % (_TABLE, ",".join("?" * len(batch))), [model_id] + batch).fetchall()
+                found.update((bytes(digest), np.frombuffer(vector, dtype=np.float16).astype(np.float32))
+                             for digest, vector in rows)
+            if found:
+                now = time.time()
+                with connection:
+                    connection.executemany("UPDATE %s SET last_used = ? WHERE model = ? AND digest = ?" % _TABLE,
+                                           [(now, model_id, digest) for digest in found])
+        except sqlite3.Error:
+            pass
+        return found
+
+    def store(self, model_id, digests, vectors):
+        """
+        Save vectors (stored as float16), replacing entries with the same key.
+
+        Args:
+            model_id (str): Model the vectors were computed with
+            digests (list): text_digest() values
+            vectors (array-like): One vector per digest
+        """
+        vectors = np.asarray(vectors, dtype=np.float16)
+        now = time.time()
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO %s (model, digest, vector, last_used) VALUES (?, ?, ?, ?)" % _TABLE,
+                    [(model_id, digest, vector.tobytes(), now) for digest, vector in zip(digests, vectors)])
+        except sqlite3.Error:
+            return
+        self._unscanned_entries += len(digests)
+        self.evict()
+
+    def evict(self, force=False):
+        """
+        Delete least recently used entries until the store fits its budget.
+
+        The count is skipped until a slice of the budget has been written
+        since the last scan, unless force is set.
+        """
+        if not force and self._unscanned_entries * EVICTION_SCAN_FRACTION < self.max_entries:
+            return
+        self._unscanned_entries = 0
+        try:
+            connection = self._connect()
+            with connection:
+                (total,) = connection.execute("SELECT COUNT(*) FROM %s" % _TABLE).fetchone()
+                if total > self.max_entries:
+                    connection.execute(
+                        "DELETE FROM %s WHERE rowid IN (SELECT rowid FROM %s ORDER BY last_used LIMIT ?)"
+                        % (_TABLE, _TABLE), (total - self.max_entries,))
+        except sqlite3.Error:
+            pass
+
+
+def default_embedding_store():
+    """
+    The process-wide embedding store, enabled by setting $EMBEDDING_STORE_DIR.
+
+    Returns:
+        EmbeddingStore: Shared store, or None when it is disabled
+    """
+    global _default_store
+    store_dir = os.environ.get("EMBEDDING_STORE_DIR")
+    if not store_dir:
+        return None
+    path = os.path.join(store_dir, "embeddings.sqlite3")
+    if _default_store is None or _default_store.path != path:
+        _default_store = EmbeddingStore(path)
+    return _default_store
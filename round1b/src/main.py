@@ -4,13 +4,33 @@ Round 1B: Persona-Driven Document Intelligence
 Analyzes multiple PDFs and extracts relevant sections based on persona and job-to-be-done.
 """
 
+import time
+
+# Deadlines are measured from process start, before the model imports
+SCRIPT_START = time.monotonic()
+
 import os
 import sys
 import json
+import argparse
 from datetime import datetime
-from pdf_extractor import extract_document_structure
-from chunking import create_semantic_chunks
+from document_pipeline import process_document
+from near_duplicates import NearDuplicateIndex
 from semantic_ranker import SemanticRanker
+from time_budget import corpus_deadlines, deadline_passed, document_deadlines
+from stage_metrics import StageMetrics, measure
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Round 1B persona-driven document intelligence")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Seconds from start by which a (possibly partial) result must be written")
+    parser.add_argument("--page-budget", type=int, default=None, help="Maximum pages parsed per document")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-stage timings and memory peaks in the output and in metrics.prom")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Re-rank candidates in waves and stop once the rest cannot make the result")
+    return parser.parse_args()
 
 
 def load_persona_config():
@@ -36,6 +56,7 @@ def load_persona_config():
 
 def main():
     """Main entry point for Round 1B persona-driven document intelligence."""
+    args = parse_args()
     
     # Setup directories
     input_dir = "/app/input"
@@ -61,44 +82,62 @@ def main():
     print(f"Persona: {persona}")
     print(f"Job to be done: {job_to_be_done}")
     
+    # Opt-in per-stage timings and memory peaks
+    metrics = StageMetrics() if args.metrics else None
+    
     # Initialize semantic ranker
     print("Loading semantic models...")
-    ranker = SemanticRanker()
+    with measure(metrics, "load_models"):
+        ranker = SemanticRanker()
     print("Models loaded successfully")
     
+    # Best-effort mode: share the time left evenly over the documents
+    deadline = None if args.deadline is None else SCRIPT_START + args.deadline
+    partial = False
+    skipped_documents = []
+    
+    # Repeated sections and boilerplate are scored once across all documents
+    duplicates = NearDuplicateIndex()
+    
     # Process each PDF and collect best chunks
     best_chunks_per_pdf = []
     pdf_paths = [os.path.join(input_dir, pdf_file) for pdf_file in pdf_files]
     
-    for pdf_path in pdf_paths:
+    extraction_deadline, rank_deadline = corpus_deadlines(deadline)
+    extracted = []
+    
+    for index, pdf_path in enumerate(pdf_paths):
         pdf_name = os.path.basename(pdf_path)
+        if deadline_passed(extraction_deadline):
+            print(f"Skipping {pdf_name}: deadline reached")
+            skipped_documents.append(pdf_name)
+            continue
+        _, extract_deadline = document_deadlines(extraction_deadline, len(pdf_paths) - index)
         print(f"Processing: {pdf_name}")
         
         try:
-            # Extract document structure
-            outline_data, doc = extract_document_structure(pdf_path)
-            
-            # Create semantic chunks
-            outline_json = json.dumps(outline_data, indent=2)
-            chunks = create_semantic_chunks(pdf_path, outline_json)
-            
-            # Rank chunks for this document
-            ranked = ranker.rank_chunks(chunks, persona, job_to_be_done)
-            
-            # Take the best chunk from this document
-            if ranked:
-                best_chunk = ranked[0]
-                best_chunk["document"] = pdf_name
-                best_chunks_per_pdf.append(best_chunk)
-            
-            # Close document to free memory
-            if doc:
-                doc.close()
+            # Extract document structure and create semantic chunks from a single parse
+            outline_data, chunks = process_document(pdf_path, deadline=extract_deadline,
+                                                    page_budget=args.page_budget, metrics=metrics)
+            partial = partial or outline_data.get('partial', False)
+            extracted.append((pdf_name, chunks))
                 
         except Exception as e:
             print(f"Error processing {pdf_name}: {str(e)}")
             continue
     
+    # Rank all documents' chunks in one pass, keeping the best chunk of each
+    print("Ranking sections...")
+    ranked_documents = ranker.rank_corpus([chunks for _, chunks in extracted], persona, job_to_be_done,
+                                          per_document=1, deadline=rank_deadline, metrics=metrics,
+                                          duplicates=duplicates, cascade=args.cascade)
+    for (pdf_name, _), ranked in zip(extracted, ranked_documents):
+        partial = partial or any(not chunk.get('reranked', True) for chunk in ranked)
+        if ranked:
+            best_chunk = ranked[0]
+            best_chunk["document"] = pdf_name
+            best_chunks_per_pdf.append(best_chunk)
+    
     if not best_chunks_per_pdf:
         print("Error: No chunks could be extracted from any document")
         sys.exit(1)
@@ -135,6 +174,13 @@ def main():
         "extracted_sections": extracted_sections,
         "subsection_analysis": subsection_analysis
     }
+    if partial or skipped_documents:
+        output["partial"] = True
+        output["metadata"]["skipped_documents"] = skipped_documents
+    if metrics is not None:
+        output["metrics"] = metrics.as_dict()
+        with open(os.path.join(output_dir, "metrics.prom"), 'w', encoding='utf-8') as f:
+            f.write(metrics.to_prometheus())
     
     # Save output
     output_path = os.path.join(output_dir, "persona_analysis.json")
@@ -0,0 +1,103 @@
+"""
+Near-Duplicate Module for Round 1B
+MinHash signatures with LSH banding to collapse repeated chunks across documents.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+
+# Estimated Jaccard similarity of word shingles at which two chunks count as duplicates
+DUPLICATE_THRESHOLD = 0.8
+
+SHINGLE_WORDS = 3
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs around Jaccard 0.5 and up become candidates,
+# then the full signature decides
+BAND_ROWS = 4
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; a * x fits in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+_WORD = re.compile(r'\w+')
+
+
+class NearDuplicateIndex:
+    """
+    Assigns each chunk text to a representative: the first earlier text it
+    nearly duplicates, or itself.
+
+    Share one index across all documents of a request so repeated sections,
+    running headers and boilerplate collapse across documents; the ranker
+    caches each representative's scores in self.scores.
+    """
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, num_permutations=NUM_PERMUTATIONS, band_rows=BAND_ROWS, seed=0):
+        """
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity for a duplicate
+            num_permutations (int): MinHash signature length; a multiple of band_rows
+            band_rows (int): Signature rows per LSH band
+            seed (int): Seed for the hash functions
+        """
+        self.threshold = threshold
+        self.band_rows = band_rows
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64)
+
+        self._signatures = []  # per representative
+        self._buckets = {}  # (band, band hash) -> representative ids
+        # Per-query scores of representatives, kept by the ranker:
+        # query -> representative id -> score entry
+        self.scores = {}
+
+    def __len__(self):
+        """Number of representatives."""
+        return len(self._signatures)
+
+    def assign(self, texts):
+        """
+        Representative id of every text, registering texts that duplicate
+        nothing seen so far as new representatives.
+
+        Args:
+            texts (list): Chunk texts
+
+        Returns:
+            list: Representative id (int) per text
+        """
+        return [self._assign(self.signature(text)) for text in texts]
+
+    def signature(self, text):
+        """MinHash signature of a text's word shingles (uint64 array)."""
+        words = _WORD.findall(text.casefold())
+        count = max(len(words) - SHINGLE_WORDS + 1, 1)
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(count)}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+    def _assign(self, signature):
+        bands = [(band, signature[start:start + self.band_rows].tobytes())
+                 for band, start in enumerate(range(0, len(signature), self.band_rows))]
+
+        # Best-matching representative among those sharing a band
+        candidates = set()
+        for key in bands:
+            candidates.update(self._buckets.get(key, ()))
+        best, best_similarity = None, 0.0
+        for candidate in sorted(candidates):
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        if best_similarity >= self.threshold:
+            return best
+
+        representative = len(self._signatures)
+        self._signatures.append(signature)
+        for key in bands:
+            self._buckets.setdefault(key, []).append(representative)
+        return representative
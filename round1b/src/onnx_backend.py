@@ -0,0 +1,151 @@
+"""
+ONNX Runtime Backend for Round 1B
+Runs the exported bi-encoder and cross-encoder on CPU, without PyTorch.
+
+Export the models first with `python export_onnx.py` from the repository root.
+"""
+
+import json
+import os
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+
+# Files written by export_onnx.py inside each model directory
+ONNX_DIR = 'onnx'
+ONNX_MODEL = 'model.onnx'
+ONNX_MODEL_INT8 = 'model_int8.onnx'
+
+
+def onnx_model_path(model_path, quantized=True):
+    """Path of a model's exported ONNX graph (int8 or fp32)."""
+    return os.path.join(model_path, ONNX_DIR, ONNX_MODEL_INT8 if quantized else ONNX_MODEL)
+
+
+def _session(path, threads=None):
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    return ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+
+
+def _tokenizer(model_path, max_length):
+    tokenizer = Tokenizer.from_file(os.path.join(model_path, 'tokenizer.json'))
+    tokenizer.enable_truncation(max_length=max_length)
+    # Pad to the longest sequence of each batch
+    tokenizer.enable_padding(pad_id=tokenizer.token_to_id('[PAD]') or 0, pad_token='[PAD]')
+    return tokenizer
+
+
+def _feed(session, encodings):
+    """Model inputs for a batch of encodings, restricted to what the graph takes."""
+    arrays = {
+        'input_ids': np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+        'attention_mask': np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+        'token_type_ids': np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+    }
+    return {model_input.name: arrays[model_input.name] for model_input in session.get_inputs()}
+
+
+class OnnxEmbeddingModel:
+    """
+    all-MiniLM-L6-v2 on ONNX Runtime: mean pooling over the token states and
+    L2 normalization, as the sentence-transformers modules do.
+
+    Implements the part of SentenceTransformer that SemanticRanker uses.
+    """
+
+    def __init__(self, model_path, quantized=True, threads=None):
+        """
+        Args:
+            model_path (str): Sentence-transformers model directory with an onnx/ export
+            quantized (bool): Use the int8 graph rather than the fp32 one
+            threads (int): Intra-op threads; ONNX Runtime picks when None
+        """
+        with open(os.path.join(model_path, 'sentence_bert_config.json'), 'r', encoding='utf-8') as f:
+            self.max_seq_length = json.load(f)['max_seq_length']
+        self.tokenizer = _tokenizer(model_path, self.max_seq_length)
+        self.session = _session(onnx_model_path(model_path, quantized), threads)
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, convert_to_tensor=False):
+        """
+        Embed one text or a list of texts.
+
+        Texts are batched in length order to limit padding; results come back
+        in input order. convert_to_tensor and show_progress_bar are accepted for
+        interface compatibility and ignored.
+
+        Returns:
+            np.ndarray: float32 embedding, or one row per text
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = None
+
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([texts[index] for index in batch])
+            feed = _feed(self.session, encodings)
+            token_states = self.session.run(None, feed)[0]
+
+            # Mean over real tokens, then unit length
+            mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.float32)[:, :, None]
+            pooled = (token_states * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            embeddings[batch] = pooled
+
+        if embeddings is None:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+class OnnxCrossEncoder:
+    """
+    ms-marco cross-encoder on ONNX Runtime.
+
+    Implements the part of CrossEncoder that SemanticRanker uses, with the
+    activation the model was saved with (none for this model: raw logits).
+    """
+
+    def __init__(self, model_path, max_length=512, quantized=True, threads=None):
+        """
+        Args:
+            model_path (str): Cross-encoder model directory with an onnx/ export
+            max_length (int): Token limit for query and passage together
+            quantized (bool): Use the int8 graph rather than the fp32 one
+            threads (int): Intra-op threads; ONNX Runtime picks when None
+        """
+        with open(os.path.join(model_path, 'config.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        # Cross-encoders saved without an activation score through a sigmoid
+        activation = config.get('sentence_transformers', {}).get('activation_fn', 'Sigmoid')
+        self.apply_sigmoid = activation.endswith('Sigmoid') and len(config.get('id2label', {0: None})) == 1
+        self.tokenizer = _tokenizer(model_path, max_length)
+        self.session = _session(onnx_model_path(model_path, quantized), threads)
+
+    def predict(self, sentences, batch_size=32, show_progress_bar=False):
+        """
+        Score (query, passage) pairs.
+
+        Returns:
+            np.ndarray: One float32 score per pair, in input order
+        """
+        pairs = [tuple(pair) for pair in sentences]
+        scores = np.zeros(len(pairs), dtype=np.float32)
+
+        order = np.argsort([-(len(query) + len(passage)) for query, passage in pairs], kind='stable')
+        for start in range(0, len(pairs), batch_size):
+            batch = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([pairs[index] for index in batch])
+            logits = self.session.run(None, _feed(self.session, encodings))[0]
+            scores[batch] = logits[:, 0]
+
+        if self.apply_sigmoid:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores
@@ -4,72 +4,116 @@ Extracts title and heading hierarchy from PDF documents using PyMuPDF.
 This is the same logic as Round 1A but used as a component in Round 1B.
 """
 
-import fitz  # PyMuPDF
 import re
-from collections import Counter, defaultdict
+from collections import defaultdict
+from page_model import build_document_model
+from pdf_source import open_pdf
+from stage_metrics import measure
 
 
-def extract_document_structure(pdf_path):
+def extract_document_structure(pdf_path, deadline=None, page_budget=None, metrics=None):
     """
     Extracts a structured outline using a robust, non-hardcoded approach.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        deadline (float): time.monotonic() value after which no more pages are parsed
+        page_budget (int): Maximum number of pages to parse
+        metrics (StageMetrics): Collects per-stage timings and counts when given
         
     Returns:
-        tuple: (outline_data dict, document object)
+        tuple: (outline_data dict, document object). Outline entries carry the
+        heading line's character offset in the page model text ("offset"), which
+        the chunker uses to cut sections. outline_data carries "partial": True
+        and "pages_processed" when not every page was read.
     """
-    doc = fitz.open(pdf_path)
+    doc, model = parse_document(pdf_path, deadline, page_budget, metrics)
+    output = outline_from_model(model, doc, metrics)
+
+    if not len(model.spans):
+        doc.close()
+        return output, None
+
+    return output, doc
+
+
+def parse_document(pdf_path, deadline=None, page_budget=None, metrics=None):
+    """
+    Open a PDF and parse its pages into the shared page model.
+
+    Args:
+        pdf_path: Path to the PDF file, or its bytes (bytes, memoryview, mmap)
+        deadline (float): time.monotonic() value after which no more pages are parsed
+        page_budget (int): Maximum number of pages to parse
+        metrics (StageMetrics): Collects "open" and "profile" stage timings when given
+
+    Returns:
+        tuple: (open fitz.Document, DocumentModel); the caller closes the document
+    """
+    with measure(metrics, "open") as counts:
+        doc = open_pdf(pdf_path)
+        counts['pages'] = doc.page_count
+
+    with measure(metrics, "profile") as counts:
+        model = build_document_model(doc, 0, page_budget, deadline=deadline)
+        counts['pages'] = model.page_count
+        counts['spans'] = len(model.spans)
+    return doc, model
+
+
+def outline_from_model(model, doc, metrics=None):
+    """
+    Heading detection and levelling over a parsed page model.
+
+    Args:
+        model (DocumentModel): Parsed document (read-only; shared with the chunker)
+        doc (fitz.Document): Open document, used for metadata and the page count
+        metrics (StageMetrics): Collects "headings", "title" and "levels" stage timings when given
+
+    Returns:
+        dict: outline_data, as returned by extract_document_structure
+    """
+    # 1. Profile the document's body text to establish a baseline
+    font_counts = model.font_histogram()
     output = {"title": "Title Not Found", "outline": []}
+    if model.page_count < doc.page_count:
+        # Best-effort outline from the pages read before the deadline or page budget
+        output['partial'] = True
+        output['pages_processed'] = model.page_count
     headings = []
-    font_counts = Counter()
-    font_size_to_lines = defaultdict(list)
-    page_texts = []
+    page_texts = model.page_texts
     page_headings = defaultdict(list)
 
-    # 1. Profile the document's body text to establish a baseline
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        page_texts.append(page.get_text())
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        font_counts[(span['size'], span['font'])] += len(span['text'].strip())
-                        font_size_to_lines[span['size']].append(span['text'].strip())
-
     if not font_counts:
-        doc.close()
-        return output, None
+        return output
 
     # Determine body text style (most common font/size combination)
     body_text_style = font_counts.most_common(1)[0][0]
     body_text_size = body_text_style[0]
 
     # 2. Extract potential headings using multi-factor heuristics
-    for page_num, page in enumerate(doc):
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-        mediabox = page.rect
-        
-        for block in text_dict.get("blocks", []):
-            if block['type'] == 0:  # text block
+    with measure(metrics, "headings") as counts:
+        for page_num in range(model.page_count):
+            mediabox = model.page_rect(page_num)
+            
+            for block in model.page_blocks(page_num):
                 # Focus on single-line blocks (typical for headings)
-                if len(block.get("lines", [])) == 1:
-                    line = block["lines"][0]
-                    line_text = "".join(s['text'] for s in line['spans']).strip()
+                block_lines = model.block_lines(block)
+                if len(block_lines) == 1:
+                    line = block_lines[0]
+                    line_text = model.line_text(line).strip()
                     
                     if not line_text:
                         continue
                         
-                    span = line['spans'][0]
-                    font_size = span['size']
-                    font_name = span['font']
-                    bbox = span['bbox'] if 'bbox' in span else None
+                    span = model.lines['first_span'][line]
+                    font_size = float(model.spans['size'][span])
+                    font_name = model.font_name(span)
+                    bbox = model.span_bbox(span)
                     
                     # Heading detection heuristics
                     is_larger = font_size > body_text_size + 0.5
-                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (span['flags'] & 16)
+                    is_bold = "bold" in font_name.lower() or "black" in font_name.lower() or (model.spans['flags'][span] & 16)
                     is_short = len(line_text.split()) < 25
                     is_not_sentence = not line_text.endswith('.')
                     is_not_date = not re.match(r'^\w+\s\d{1,2},\s\d{4}', line_text)
@@ -89,9 +133,11 @@ def extract_document_structure(pdf_path):
                         headings.append({
                             'text': line_text,
                             'size': font_size,
-                            'page': page_num + 1
+                            'page': page_num + 1,
+                            'offset': int(model.spans['start'][span])
                         })
                         page_headings[page_num + 1].append(line_text)
+        counts['headings'] = len(headings)
 
     # 3. Handle cover page detection (adjust page numbers if needed)
     if len(page_headings.get(1, [])) == 0 and len(page_texts) > 1:
@@ -101,57 +147,61 @@ def extract_document_structure(pdf_path):
                 h['page'] = max(1, h['page'] - 1)
 
     # 4. Identify the document title
-    title = None
-    
-    # Try PDF metadata first
-    try:
-        meta = doc.metadata
-        if meta and meta.get('title') and meta['title'].strip().lower() != 'untitled':
-            title = meta['title'].strip()
-    except Exception:
-        pass
-    
-    # If no metadata title, use largest heading from first 2 pages
-    if not title:
-        first_page_headings = sorted(
-            [h for h in headings if h['page'] <= 2], 
-            key=lambda x: x['size'], 
-            reverse=True
-        )
-        if first_page_headings:
-            title = first_page_headings[0]['text']
-    
-    # Fallback to first heading
-    if not title and headings:
-        title = headings[0]['text']
-    
-    output['title'] = title if title else "Title Not Found"
-
-    # 5. Assign hierarchy levels based on font size clustering
-    if headings:
-        unique_sizes = sorted(list(set([h['size'] for h in headings])), reverse=True)
+    with measure(metrics, "title"):
+        title = None
+        
+        # Try PDF metadata first
+        try:
+            meta = doc.metadata
+            if meta and meta.get('title') and meta['title'].strip().lower() != 'untitled':
+                title = meta['title'].strip()
+        except Exception:
+            pass
         
-        # Map font sizes to heading levels (H1, H2, H3 only)
-        size_map = {}
-        if len(unique_sizes) >= 3:
-            size_map[unique_sizes[0]] = "H1"
-            size_map[unique_sizes[1]] = "H2"
-            for s in unique_sizes[2:]:
-                size_map[s] = "H3"
-        elif len(unique_sizes) == 2:
-            size_map[unique_sizes[0]] = "H1"
-            size_map[unique_sizes[1]] = "H2"
-        elif len(unique_sizes) == 1:
-            size_map[unique_sizes[0]] = "H1"
+        # If no metadata title, use largest heading from first 2 pages
+        if not title:
+            first_page_headings = sorted(
+                [h for h in headings if h['page'] <= 2], 
+                key=lambda x: x['size'], 
+                reverse=True
+            )
+            if first_page_headings:
+                title = first_page_headings[0]['text']
         
-        # Build final outline with proper ordering
-        for h in sorted(headings, key=lambda x: (x['page'], -x['size'])):
-            level = size_map.get(h['size'], "H3")
-            if level in {"H1", "H2", "H3"}:
-                output['outline'].append({
-                    "level": level,
-                    "text": h['text'],
-                    "page": h['page']
-                })
-
-    return output, doc
\ No newline at end of file
+        # Fallback to first heading
+        if not title and headings:
+            title = headings[0]['text']
+        
+        output['title'] = title if title else "Title Not Found"
+
+    # 5. Assign hierarchy levels based on font size clustering
+    with measure(metrics, "levels") as counts:
+        if headings:
+            unique_sizes = sorted(list(set([h['size'] for h in headings])), reverse=True)
+            
+            # Map font sizes to heading levels (H1, H2, H3 only)
+            size_map = {}
+            if len(unique_sizes) >= 3:
+                size_map[unique_sizes[0]] = "H1"
+                size_map[unique_sizes[1]] = "H2"
+                for s in unique_sizes[2:]:
+                    size_map[s] = "H3"
+            elif len(unique_sizes) == 2:
+                size_map[unique_sizes[0]] = "H1"
+                size_map[unique_sizes[1]] = "H2"
+            elif len(unique_sizes) == 1:
+                size_map[unique_sizes[0]] = "H1"
+            
+            # Build final outline with proper ordering
+            for h in sorted(headings, key=lambda x: (x['page'], -x['size'])):
+                level = size_map.get(h['size'], "H3")
+                if level in {"H1", "H2", "H3"}:
+                    output['outline'].append({
+                        "level": level,
+                        "text": h['text'],
+                        "page": h['page'],
+                        "offset": h['offset']
+                    })
+        counts['headings'] = len(output['outline'])
+
+    return output
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+PDF Input Sources
+Opens PDFs from file paths or in-memory buffers, and frames several PDFs on one byte stream.
+"""
+
+import hashlib
+import os
+import struct
+
+import fitz  # PyMuPDF
+
+
+# Frame header: big-endian name length (4 bytes); the name is followed by the payload length (8 bytes)
+_NAME_LENGTH = struct.Struct(">I")
+_PAYLOAD_LENGTH = struct.Struct(">Q")
+
+
+def buffer_digest(data):
+    """SHA-256 hex digest of an in-memory PDF."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def open_pdf(source):
+    """
+    Open a PDF from a path or an in-memory buffer.
+
+    Buffers are opened with fitz.open(stream=...), so no temporary file is
+    written. PyMuPDF only accepts bytes and bytearray streams, so memoryview
+    and mmap sources are copied once into memory. The buffer's digest is
+    recorded on the document for the page cache.
+
+    Args:
+        source: File path, or PDF bytes / bytearray / memoryview / mmap
+
+    Returns:
+        fitz.Document: Open document
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+
+    data = source if isinstance(source, (bytes, bytearray)) else bytes(source)
+    doc = fitz.open(stream=data, filetype="pdf")
+    doc.source_digest = buffer_digest(data)
+    return doc
+
+
+def source_name(source, default="document.pdf"):
+    """File name of a path source, or the default for in-memory buffers."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return default
+
+
+def read_pdf_frames(stream):
+    """
+    Read (name, bytes) pairs from a binary stream until EOF.
+
+    Each frame is a 4-byte name length, the UTF-8 name, an 8-byte payload
+    length and the PDF bytes, all lengths big-endian.
+
+    Returns:
+        list: (name, bytes) tuples in stream order
+    """
+    documents = []
+    while True:
+        header = stream.read(_NAME_LENGTH.size)
+        if not header:
+            return documents
+        if len(header) != _NAME_LENGTH.size:
+            raise ValueError("Truncated PDF frame stream")
+        name = _read_exact(stream, _NAME_LENGTH.unpack(header)[0]).decode('utf-8')
+        size = _PAYLOAD_LENGTH.unpack(_read_exact(stream, _PAYLOAD_LENGTH.size))[0]
+        documents.append((name, _read_exact(stream, size)))
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated PDF frame stream")
+    return data
@@ -1,11 +1,34 @@
 """
 Semantic Ranking Module for Round 1B
 Uses sentence transformers and cross-encoders to rank document chunks by relevance.
+
+Models run on PyTorch through sentence-transformers, or on ONNX Runtime with
+int8 weights (onnx_backend); each backend's packages are imported only when used.
 """
 
-from sentence_transformers import SentenceTransformer, CrossEncoder, util
-import torch
+import numpy as np
 import os
+import time
+
+from dynamic_batching import EMBEDDING_BATCH_TOKENS, RERANK_BATCH_TOKENS, run_in_batches
+from embedding_store import default_embedding_store, text_digest
+from stage_metrics import measure
+from token_windows import RERANK_MAX_TOKENS, SectionWindows, load_tokenizer
+
+
+# Embedding model directory under model_dir; with the backend, its key in the embedding store
+EMBEDDING_MODEL_ID = 'all-MiniLM-L6-v2'
+RERANKER_MODEL_ID = 'cross-encoder-ms-marco-MiniLM-L6-v2'
+
+BACKENDS = ('torch', 'onnx')
+
+# Cascade re-ranking: candidates per cross-encoder wave, the top-N a candidate must be
+# able to enter (per document, unless per_document sets it), scored pairs needed
+# before the score bound is trusted, and its safety margin in residual deviations
+CASCADE_WAVE = 8
+CASCADE_TOP_N = 5
+CASCADE_MIN_CALIBRATION = 8
+CASCADE_SIGMAS = 3.0
 
 
 class SemanticRanker:
@@ -13,84 +36,381 @@ class SemanticRanker:
     Semantic ranker that uses embedding models for retrieval and cross-encoders for re-ranking.
     """
     
-    def __init__(self, model_dir="/app/models"):
+    def __init__(self, model_dir="/app/models", embedding_store=None, backend=None):
         """
         Initialize the semantic ranker with pre-downloaded models.
         
         Args:
             model_dir (str): Directory containing the pre-downloaded models
+            embedding_store (EmbeddingStore): Persistent store of chunk embeddings;
+                defaults to the one enabled by $EMBEDDING_STORE_DIR, if any
+            backend (str): 'torch' (sentence-transformers) or 'onnx' (ONNX Runtime,
+                int8, models exported by export_onnx.py); defaults to
+                $RANKER_BACKEND or 'torch'
         """
-        # Load embedding model for retrieval (optimized for speed)
-        embedding_model_path = os.path.join(model_dir, 'all-MiniLM-L6-v2')
-        self.embedding_model = SentenceTransformer(embedding_model_path)
-        
-        # Load cross-encoder for re-ranking (highest accuracy)
-        reranker_model_path = os.path.join(model_dir, 'cross-encoder-ms-marco-MiniLM-L6-v2')
-        self.reranker = CrossEncoder(reranker_model_path)
+        self.backend = backend or os.environ.get("RANKER_BACKEND", "torch")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown ranker backend: {self.backend} (expected one of {', '.join(BACKENDS)})")
+        embedding_model_path = os.path.join(model_dir, EMBEDDING_MODEL_ID)
+        reranker_model_path = os.path.join(model_dir, RERANKER_MODEL_ID)
+
+        if self.backend == 'onnx':
+            from onnx_backend import OnnxCrossEncoder, OnnxEmbeddingModel
+
+            self.embedding_model = OnnxEmbeddingModel(embedding_model_path)
+            self.reranker = OnnxCrossEncoder(reranker_model_path, max_length=RERANK_MAX_TOKENS)
+            # int8 vectors differ from fp32 ones; keep them apart in the store
+            self.embedding_store_key = f"{EMBEDDING_MODEL_ID}:onnx-int8"
+        else:
+            from sentence_transformers import SentenceTransformer, CrossEncoder
+            import torch
+
+            # Load embedding model for retrieval (optimized for speed)
+            self.embedding_model = SentenceTransformer(embedding_model_path)
+            
+            # Load cross-encoder for re-ranking (highest accuracy)
+            self.reranker = CrossEncoder(reranker_model_path, max_length=RERANK_MAX_TOKENS)
+            self.embedding_store_key = f"{EMBEDDING_MODEL_ID}:torch"
+            
+            # Enable GPU if available for maximum speed
+            if torch.cuda.is_available():
+                self.embedding_model = self.embedding_model.cuda()
+                self.reranker.model = self.reranker.model.cuda()
         
-        # Enable GPU if available for maximum speed
-        if torch.cuda.is_available():
-            self.embedding_model = self.embedding_model.cuda()
-            self.reranker.model = self.reranker.model.cuda()
+        # Fast tokenizer for cutting long sections into windows the models see whole
+        self.tokenizer = load_tokenizer(model_dir)
 
-    def rank_chunks(self, chunks, persona, job_to_be_done):
+        # Vectors computed by earlier requests and other workers
+        self.embedding_store = embedding_store if embedding_store is not None else default_embedding_store()
+
+    def rank_chunks(self, chunks, persona, job_to_be_done, deadline=None, metrics=None, duplicates=None,
+                    cascade=False, max_pairs=None):
         """
         Rank document chunks based on relevance to persona and job-to-be-done.
         
+        Sections longer than the embedding model's sequence limit are split
+        into overlapping token windows; a section scores as its best window.
+        The cross-encoder then reads each candidate's best window widened to
+        its own, larger limit. To rank several documents, rank_corpus does it
+        in one pass.
+        
         Args:
             chunks (list): List of document chunks to rank
             persona (str): Description of the user's role and expertise
             job_to_be_done (str): Specific task the user needs to accomplish
+            deadline (float): time.monotonic() value; once passed, the cross-encoder
+                is skipped and chunks are ranked by embedding similarity alone
+            metrics (StageMetrics): Collects "dedup", "encode" and "rerank" stage timings when given
+            duplicates (NearDuplicateIndex): Shared across the documents of a request,
+                near-duplicate chunks are scored once: only a representative is
+                encoded and re-ranked, and its duplicates (here or in earlier
+                calls) take its scores
+            cascade (bool): Re-rank in waves and stop early (see rank_corpus)
+            max_pairs (int): Cross-encoder pair budget in cascade mode
             
         Returns:
-            list: Ranked list of chunks with relevance scores
+            list: Ranked list of chunks with relevance scores and 'best_window',
+            the passage that scored. Chunks scored through a representative
+            carry 'duplicate_of' (its doc_name, section_title, page_number).
+            Chunks ranked without the cross-encoder carry 'reranked': False.
+        """
+        return self.rank_corpus([chunks], persona, job_to_be_done, deadline=deadline, metrics=metrics,
+                                duplicates=duplicates, cascade=cascade, max_pairs=max_pairs)[0]
+
+    def rank_corpus(self, documents, persona, job_to_be_done, per_document=None, deadline=None, metrics=None,
+                    duplicates=None, cascade=False, max_pairs=None):
+        """
+        Rank the chunks of several documents together.
+
+        The query is encoded once with every document's windows (the encoder
+        sorts them by length into full batches), candidates are chosen over the
+        whole corpus, and the cross-encoder scores them all in one pass. Each
+        document's best per_document chunks by embedding similarity are always
+        candidates, so every document can fill its quota.
+
+        In cascade mode the cross-encoder scores candidates in waves, best
+        embedding similarity first. After each wave a linear fit of re-ranker
+        scores on embedding similarity, widened by its largest residual, bounds
+        what the remaining candidates could score; once none could enter its
+        document's top per_document (CASCADE_TOP_N when None), or max_pairs
+        pairs were scored, the rest are dropped. Easy queries stop after a wave
+        or two, hard ones re-rank every candidate.
+
+        Args:
+            documents (list): One list of chunks per document
+            persona (str): Description of the user's role and expertise
+            job_to_be_done (str): Specific task the user needs to accomplish
+            per_document (int): Ranked chunks kept per document; all candidates when None
+            deadline (float): time.monotonic() value; once passed, the cross-encoder
+                is skipped and chunks are ranked by embedding similarity alone
+            metrics (StageMetrics): Collects "dedup", "encode" and "rerank" stage timings when given
+            duplicates (NearDuplicateIndex): Near-duplicate chunks, within and across
+                documents and earlier calls, are scored once (see rank_chunks)
+            cascade (bool): Re-rank in waves with early exit; results then hold
+                only the re-ranked candidates
+            max_pairs (int): Cross-encoder pair budget in cascade mode; unlimited when None
+
+        Returns:
+            list: One ranked list per document, in the format rank_chunks returns
         """
+        chunks = [chunk for document_chunks in documents for chunk in document_chunks]
         if not chunks:
-            return []
+            return [[] for _ in documents]
+        document_of = [index for index, document_chunks in enumerate(documents) for _ in document_chunks]
         
         # Step 1: Build rich query string
         query = f"{persona}. Task: {job_to_be_done}"
-
-        # Step 2: Fast retrieval with embedding similarity
-        query_embedding = self.embedding_model.encode(query, convert_to_tensor=True)
         chunk_texts = [chunk['content'] for chunk in chunks]
-        
-        # Batch encode for speed
-        chunk_embeddings = self.embedding_model.encode(
-            chunk_texts, 
-            convert_to_tensor=True,
-            batch_size=32,  # Optimized batch size
-            show_progress_bar=False
-        )
 
-        # Compute cosine similarities
-        cosine_scores = util.cos_sim(query_embedding, chunk_embeddings)[0]
+        # Step 2: Collapse near-duplicates onto representatives, whose scores are
+        # kept per query; without an index every chunk represents itself
+        with measure(metrics, "dedup") as counts:
+            if duplicates is None:
+                keys = list(range(len(chunks)))
+                entries = {}
+            else:
+                keys = duplicates.assign(chunk_texts)
+                entries = duplicates.scores.setdefault(query, {})
+            members = {}
+            for idx, key in enumerate(keys):
+                members.setdefault(key, []).append(idx)
+            new_keys = [key for key in members if key not in entries]
+            counts['chunks'] = len(chunks)
+            counts['representatives'] = len(members)
+            counts['cached'] = len(members) - len(new_keys)
 
-        # Get top 50 candidates for re-ranking (balance speed vs accuracy)
-        top_k = min(50, len(chunks))
-        top_results = cosine_scores.topk(top_k)
-        
-        top_indices = top_results.indices.cpu().tolist()
-        top_scores = top_results.values.cpu().tolist()
+        # Step 3: Fast retrieval with embedding similarity over section windows
+        window_tokens = self.embedding_model.max_seq_length - self.tokenizer.num_special_tokens_to_add(False)
+        if new_keys:
+            with measure(metrics, "encode") as counts:
+                windows = SectionWindows(self.tokenizer, [chunk_texts[members[key][0]] for key in new_keys],
+                                         window_tokens)
+                
+                # Batch encode the query with the windows, skipping stored vectors
+                embeddings, stored = self._encode([query] + windows.window_texts())
 
-        # Step 3: Precision re-ranking with cross-encoder
-        pairs = [[query, chunk_texts[idx]] for idx in top_indices]
-        
-        # Batch predict for maximum speed
-        rerank_scores = self.reranker.predict(
-            pairs, 
-            batch_size=16,  # Optimized for cross-encoder
+                # Compute cosine similarities and keep each section's best window
+                cosine_scores = _cosine_similarity(embeddings[0], embeddings[1:])
+                section_scores, best_window = windows.aggregate(cosine_scores)
+
+                # Cross-encoder passage budget: what the query and special tokens leave
+                # of its limit, never less than the window that was retrieved
+                query_tokens = len(self.tokenizer.encode(query, add_special_tokens=False))
+                passage_tokens = max(RERANK_MAX_TOKENS - self.tokenizer.num_special_tokens_to_add(True) - query_tokens,
+                                     window_tokens)
+                for position, key in enumerate(new_keys):
+                    entries[key] = {
+                        'chunk': chunks[members[key][0]],
+                        'cosine': float(section_scores[position]),
+                        'window': windows.widen(best_window[position], window_tokens),
+                        'passage': windows.widen(best_window[position], passage_tokens),
+                    }
+                counts['chunks'] = len(new_keys)
+                counts['windows'] = len(windows)
+                counts['stored'] = stored
+
+        # Get top 50 candidates for re-ranking (balance speed vs accuracy),
+        # topped up with each document's quota
+        by_cosine = sorted(members, key=lambda key: -entries[key]['cosine'])
+        candidates = set(by_cosine[:50])
+        if per_document:
+            quota = [0] * len(documents)
+            for key in by_cosine:
+                for document in {document_of[idx] for idx in members[key]}:
+                    if quota[document] < per_document:
+                        quota[document] += 1
+                        candidates.add(key)
+        top_keys = [key for key in by_cosine if key in candidates]
+
+        # Out of time: return the retrieval ranking instead of re-ranking
+        if deadline is not None and time.monotonic() >= deadline:
+            return self._per_document(chunks, document_of, len(documents), members, top_keys, entries,
+                                      per_document, reranked=False)
+
+        # Step 4: Precision re-ranking with cross-encoder, for candidates not scored before
+        unscored = [key for key in top_keys if 'rerank' not in entries[key]]
+        if unscored and cascade:
+            with measure(metrics, "rerank") as counts:
+                top_n = per_document or CASCADE_TOP_N
+                document_keys = {key: {document_of[idx] for idx in members[key]} for key in top_keys}
+                counts['pairs'], counts['waves'] = self._rerank_cascade(query, top_keys, entries, document_keys,
+                                                                        top_n, max_pairs)
+                counts['skipped'] = sum('rerank' not in entries[key] for key in top_keys)
+            top_keys = [key for key in top_keys if 'rerank' in entries[key]]
+        elif unscored:
+            with measure(metrics, "rerank") as counts:
+                pairs = [[query, entries[key]['passage']] for key in unscored]
+                
+                # Batch predict for maximum speed
+                rerank_scores = self._predict(pairs)
+                for key, score in zip(unscored, rerank_scores):
+                    entries[key]['rerank'] = float(score)
+                counts['pairs'] = len(pairs)
+
+        # Step 5: Build final ranked lists, duplicates next to their representative
+        return self._per_document(chunks, document_of, len(documents), members, top_keys, entries, per_document)
+
+    def _rerank_cascade(self, query, top_keys, entries, document_keys, top_n, max_pairs):
+        """
+        Cross-encoder scores for candidates in waves, in the given (best first)
+        order, until the rest cannot enter a document's top_n or max_pairs is spent.
+
+        Returns:
+            tuple: (pairs scored, waves run)
+        """
+        pending = [key for key in top_keys if 'rerank' not in entries[key]]
+        pairs_scored = waves = 0
+        while pending:
+            wave_size = CASCADE_WAVE if max_pairs is None else min(CASCADE_WAVE, max_pairs - pairs_scored)
+            if wave_size <= 0:
+                break
+            wave, pending = pending[:wave_size], pending[wave_size:]
+            scores = self._predict([[query, entries[key]['passage']] for key in wave])
+            for key, score in zip(wave, scores):
+                entries[key]['rerank'] = float(score)
+            pairs_scored += len(wave)
+            waves += 1
+            if pending and _cascade_settled(top_keys, pending, entries, document_keys, top_n):
+                break
+        return pairs_scored, waves
+
+    def _token_lengths(self, inputs, limit):
+        """Token count of each text or (query, passage) pair as the model sees it, special tokens included."""
+        return [min(len(encoding), limit) for encoding in self.tokenizer.encode_batch(inputs)]
+
+    def _embed(self, texts):
+        """
+        Embedding model outputs for texts, in length-sorted batches under a token budget.
+
+        Returns:
+            np.ndarray: float32 embedding matrix, one row per text in input order
+        """
+        lengths = self._token_lengths(texts, self.embedding_model.max_seq_length)
+        vectors = run_in_batches(texts, lengths, EMBEDDING_BATCH_TOKENS, lambda batch: self.embedding_model.encode(
+            batch,
+            batch_size=len(batch),
             show_progress_bar=False
-        )
+        ))
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _predict(self, pairs):
+        """
+        Cross-encoder scores for (query, passage) pairs, in length-sorted batches under a token budget.
+
+        Returns:
+            np.ndarray: One score per pair, in input order
+        """
+        lengths = self._token_lengths([tuple(pair) for pair in pairs], RERANK_MAX_TOKENS)
+        scores = run_in_batches(pairs, lengths, RERANK_BATCH_TOKENS, lambda batch: self.reranker.predict(
+            batch,
+            batch_size=len(batch),
+            show_progress_bar=False
+        ))
+        return np.asarray(scores, dtype=np.float32)
+
+    def _per_document(self, chunks, document_of, document_count, members, top_keys, entries, per_document,
+                      reranked=True):
+        """
+        Split scored candidates back into one ranked list per document.
 
-        # Step 4: Build final ranked list
-        ranked_chunks = []
-        for idx, score in zip(top_indices, rerank_scores):
-            chunk = chunks[idx].copy()
-            chunk['score'] = float(score)
-            ranked_chunks.append(chunk)
+        Lists are sorted by re-ranker score, or by embedding similarity when
+        not reranked, and cut to per_document.
+        """
+        ranked_documents = [[] for _ in range(document_count)]
+        for key in top_keys:
+            entry = entries[key]
+            score, passage = (entry['rerank'], entry['passage']) if reranked else (entry['cosine'], entry['window'])
+            for idx in members[key]:
+                ranked_documents[document_of[idx]].append(
+                    self._ranked_chunk(chunks[idx], entry, score, passage, reranked))
+
+        for ranked_chunks in ranked_documents:
+            # Sort by score descending
+            ranked_chunks.sort(key=lambda x: -x['score'])
+            if per_document:
+                del ranked_chunks[per_document:]
+        return ranked_documents
+
+    def _encode(self, texts):
+        """
+        Embed texts, encoding only those missing from the embedding store.
+
+        Returns:
+            tuple: (float32 embedding matrix with one row per text, number of texts served from the store)
+        """
+        if self.embedding_store is None:
+            return self._embed(texts), 0
+
+        digests = [text_digest(text) for text in texts]
+        vectors = self.embedding_store.load(self.embedding_store_key, digests)
+        stored = sum(digest in vectors for digest in digests)
+
+        missing = {}
+        for text, digest in zip(texts, digests):
+            if digest not in vectors:
+                missing.setdefault(digest, text)
+        if missing:
+            encoded = self._embed(list(missing.values()))
+            # Round like the store does, so a result does not depend on whether it was cached
+            encoded = np.asarray(encoded, dtype=np.float16)
+            self.embedding_store.store(self.embedding_store_key, list(missing), encoded)
+            vectors.update(zip(missing, encoded.astype(np.float32)))
+
+        return np.stack([vectors[digest] for digest in digests]), stored
+
+    @staticmethod
+    def _ranked_chunk(chunk, entry, score, passage, reranked=True):
+        """Copy of a chunk carrying its representative's score."""
+        ranked = chunk.copy()
+        ranked['score'] = score
+        ranked['best_window'] = passage
+        if entry['chunk'] is not chunk:
+            source = entry['chunk']
+            ranked['duplicate_of'] = {key: source.get(key) for key in ('doc_name', 'section_title', 'page_number')}
+        if not reranked:
+            ranked['reranked'] = False
+        return ranked
+
+
+def _cosine_similarity(query, matrix):
+    """Cosine similarity of one vector with every row of a matrix."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query) / np.maximum(norms, 1e-12)
+
+
+def _cascade_settled(top_keys, pending, entries, document_keys, top_n):
+    """
+    Whether no pending candidate could enter its documents' top_n.
+
+    A pending candidate's re-ranker score is bounded by a least-squares line
+    through the scored candidates' (embedding similarity, re-ranker score)
+    points plus a margin of the largest residual (at least CASCADE_SIGMAS
+    standard deviations). Without enough points, or when the scores do not
+    rise with similarity, nothing can be ruled out.
+    """
+    scored = [key for key in top_keys if 'rerank' in entries[key]]
+    if len(scored) < CASCADE_MIN_CALIBRATION:
+        return False
+    similarity = np.array([entries[key]['cosine'] for key in scored])
+    rerank = np.array([entries[key]['rerank'] for key in scored])
+    if np.ptp(similarity) <= 0:
+        return False
+    slope, intercept = np.polyfit(similarity, rerank, 1)
+    if not slope > 0:
+        return False
+    residuals = rerank - (slope * similarity + intercept)
+    margin = max(float(residuals.max()), CASCADE_SIGMAS * float(residuals.std()))
 
-        # Sort by re-ranker score descending
-        ranked_chunks.sort(key=lambda x: -x['score'])
+    # Score to beat per document: its top_n-th best so far; a document short of top_n takes anything
+    document_scores = {}
+    for key in scored:
+        for document in document_keys[key]:
+            document_scores.setdefault(document, []).append(entries[key]['rerank'])
+    bars = {document: sorted(scores, reverse=True)[top_n - 1]
+            for document, scores in document_scores.items() if len(scores) >= top_n}
 
-        return ranked_chunks
\ No newline at end of file
+    for key in pending:
+        bound = slope * entries[key]['cosine'] + intercept + margin
+        if any(bound > bars.get(document, -np.inf) for document in document_keys[key]):
+            return False
+    return True
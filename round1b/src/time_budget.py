@@ -0,0 +1,58 @@
+"""
+Time Budget Helpers for Round 1B
+Splits a pipeline deadline into per-document extraction and ranking deadlines.
+"""
+
+import time
+
+
+# Seconds kept back from the pipeline deadline for final selection and output
+FINAL_RESERVE_SECONDS = 0.5
+
+# Share of a document's time slot given to outline extraction; ranking gets the rest
+EXTRACTION_SHARE = 0.5
+
+
+def document_deadlines(deadline, documents_left):
+    """
+    Deadlines for the next document when the remaining time is shared evenly.
+
+    Args:
+        deadline (float): Pipeline deadline as a time.monotonic() value, or None
+        documents_left (int): Documents still to process, including the next one
+
+    Returns:
+        tuple: (extraction deadline, ranking deadline); (None, None) without a deadline
+    """
+    if deadline is None:
+        return None, None
+
+    now = time.monotonic()
+    slot = max(0.0, deadline - FINAL_RESERVE_SECONDS - now) / max(1, documents_left)
+    return now + slot * EXTRACTION_SHARE, now + slot
+
+
+def corpus_deadlines(deadline):
+    """
+    Deadlines when every document is extracted before one ranking pass over them all.
+
+    Extraction gets EXTRACTION_SHARE of the remaining time; pass the first value
+    to document_deadlines to share it over the documents.
+
+    Args:
+        deadline (float): Pipeline deadline as a time.monotonic() value, or None
+
+    Returns:
+        tuple: (extraction phase deadline, ranking deadline); (None, None) without a deadline
+    """
+    if deadline is None:
+        return None, None
+
+    now = time.monotonic()
+    available = max(0.0, deadline - FINAL_RESERVE_SECONDS - now)
+    # The phase deadline keeps its own reserve, which document_deadlines takes off again
+    return now + available * EXTRACTION_SHARE + FINAL_RESERVE_SECONDS, deadline - FINAL_RESERVE_SECONDS
+
+
+def deadline_passed(deadline):
+    return deadline is not None and time.monotonic() >= deadline - FINAL_RESERVE_SECONDS
@@ -0,0 +1,131 @@
+"""
+Token Windows Module for Round 1B
+Splits section chunks into overlapping windows that fit the models' token limits.
+"""
+
+import os
+
+import numpy as np
+from tokenizers import Tokenizer
+
+
+# Sequence limits, in tokens including [CLS]/[SEP]: all-MiniLM-L6-v2 was
+# trained at 256, the ms-marco cross-encoder accepts 512 for query and passage
+EMBEDDING_MAX_TOKENS = 256
+RERANK_MAX_TOKENS = 512
+
+# Tokens shared by neighbouring windows, so a sentence cut at one window's
+# edge is whole in the next
+WINDOW_OVERLAP = 64
+
+
+def load_tokenizer(model_dir):
+    """
+    Load the fast tokenizer bundled with the embedding model.
+
+    Both models share the same uncased WordPiece vocabulary, so one tokenizer
+    budgets windows for either.
+
+    Args:
+        model_dir (str): Directory containing the pre-downloaded models
+
+    Returns:
+        Tokenizer: Tokenizer with truncation and padding turned off
+    """
+    tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'all-MiniLM-L6-v2', 'tokenizer.json'))
+    # tokenizer.json ships with truncation and padding at 128; windows need every token
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+class SectionWindows:
+    """
+    Overlapping token windows over a list of section texts.
+
+    Windows are stored section by section, so window i belongs to section
+    self.section[i] and every section has at least one window. A section that
+    fits in one window is its own window, text unchanged.
+    """
+
+    def __init__(self, tokenizer, texts, max_tokens, overlap=WINDOW_OVERLAP):
+        """
+        Args:
+            tokenizer (Tokenizer): From load_tokenizer()
+            texts (list): Section texts
+            max_tokens (int): Window length in tokens, special tokens excluded
+            overlap (int): Tokens shared by consecutive windows of a section
+        """
+        self.texts = texts
+        self.max_tokens = max_tokens
+        encodings = tokenizer.encode_batch(texts, add_special_tokens=False)
+        # Character span of every token, per section
+        self.offsets = [np.asarray(encoding.offsets, dtype=np.int64).reshape(-1, 2) for encoding in encodings]
+
+        step = max(1, max_tokens - min(overlap, max_tokens - 1))
+        sections, starts, ends = [], [], []
+        for index, offsets in enumerate(self.offsets):
+            token_count = len(offsets)
+            window_starts = list(range(0, max(token_count - max_tokens, 0) + 1, step))
+            # The last window ends on the section's last token
+            if window_starts[-1] + max_tokens < token_count:
+                window_starts.append(token_count - max_tokens)
+            sections.extend([index] * len(window_starts))
+            starts.extend(window_starts)
+            ends.extend(min(start + max_tokens, token_count) for start in window_starts)
+
+        self.section = np.asarray(sections, dtype=np.int64)
+        self.token_start = np.asarray(starts, dtype=np.int64)
+        self.token_end = np.asarray(ends, dtype=np.int64)
+        # Index of each section's first window
+        self.first_window = np.searchsorted(self.section, np.arange(len(texts)))
+
+    def __len__(self):
+        return len(self.section)
+
+    def window_texts(self):
+        """Text of every window, in window order."""
+        return [self._text(self.section[i], self.token_start[i], self.token_end[i]) for i in range(len(self))]
+
+    def widen(self, window, max_tokens):
+        """
+        Text of a window grown (or shrunk) to max_tokens around its centre,
+        within its section.
+
+        Args:
+            window (int): Window index
+            max_tokens (int): Token length of the returned passage
+
+        Returns:
+            str: Passage text
+        """
+        section = self.section[window]
+        token_count = len(self.offsets[section])
+        length = min(max_tokens, token_count)
+        centre = (int(self.token_start[window]) + int(self.token_end[window])) // 2
+        start = min(max(centre - length // 2, 0), token_count - length)
+        return self._text(section, start, start + length)
+
+    def aggregate(self, window_scores):
+        """
+        Section scores from window scores: a section scores as its best window.
+
+        Args:
+            window_scores (array-like): One score per window
+
+        Returns:
+            tuple: (float array of section scores, int array of each section's best window)
+        """
+        window_scores = np.asarray(window_scores, dtype=np.float64)
+        section_scores = np.maximum.reduceat(window_scores, self.first_window)
+        # Earliest window reaching its section's maximum
+        is_best = window_scores == section_scores[self.section]
+        best_windows = np.flatnonzero(is_best)
+        best_window = best_windows[np.searchsorted(self.section[best_windows], np.arange(len(self.texts)))]
+        return section_scores, best_window
+
+    def _text(self, section, start, end):
+        offsets = self.offsets[section]
+        if start == 0 and end >= len(offsets):
+            return self.texts[section]
+        return self.texts[section][offsets[start, 0]:offsets[end - 1, 1]]
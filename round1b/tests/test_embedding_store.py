@@ -0,0 +1,36 @@
+"""
+Embedding store eviction when every batch comes from a fresh EmbeddingStore,
+as with the portal scripts' one process per request.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from embedding_store import _TABLE, EVICTION_SCAN_FRACTION, EmbeddingStore, text_digest
+
+
+BATCH = 4
+
+
+def _entry_count(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM %s" % _TABLE).fetchone()[0]
+
+
+def test_fresh_store_per_batch_stays_within_budget(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    # A scan slice holds two batches, so no single batch reaches it on its own
+    max_entries = 2 * EVICTION_SCAN_FRACTION * BATCH
+    random.seed(0)
+    for batch in range(4 * max_entries // BATCH):
+        store = EmbeddingStore(path, max_entries=max_entries)
+        digests = [text_digest("batch %d text %d" % (batch, index)) for index in range(BATCH)]
+        store.store("model", digests, np.random.rand(BATCH, 8))
+        # Between scans the store overshoots by a few scan slices at most
+        assert _entry_count(path) <= max_entries + 8 * max_entries // EVICTION_SCAN_FRACTION